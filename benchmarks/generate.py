@@ -0,0 +1,257 @@
+"""Benchmark favicon generation throughput, per-set latency, peak memory & output size.
+
+Run with `python benchmarks/generate.py [--output results.json] [--baseline old.json]`. Each
+scenario (a code path, source format, source size, transparency setting & quality preset)
+generates the full favicon set `--runs` times, in a fresh process so its peak memory is its own.
+Results are written as JSON, and compared against a previous run's results if `--baseline` is
+given.
+"""
+
+# Standard Library
+import sys
+import json
+import math
+import time
+import asyncio
+import argparse
+import platform
+import resource
+import tempfile
+import subprocess
+from typing import Any, Dict, List, Optional, NamedTuple
+from pathlib import Path
+from datetime import datetime, timezone
+from importlib import metadata
+
+# Third Party
+import PIL
+from resize_quality import synthetic_source
+
+# Project
+from favicons import Favicons
+from favicons._resize import DEFAULT_QUALITY, QUALITY_PRESETS
+
+ROOT = Path(__file__).resolve().parent.parent
+
+PATHS = ("sync", "async", "cli")
+FORMATS = ("png", "jpg", "tiff", "svg")
+SIZES = (128, 1024, 4096)
+RUNS = 5
+
+SVG = """<svg xmlns="http://www.w3.org/2000/svg" width="{size}" height="{size}"
+  viewBox="0 0 100 100">
+  <defs>
+    <linearGradient id="g" x1="0" y1="0" x2="1" y2="1">
+      <stop offset="0" stop-color="#1464dc"/>
+      <stop offset="1" stop-color="#c81e3c"/>
+    </linearGradient>
+  </defs>
+  <circle cx="50" cy="50" r="44" fill="url(#g)"/>
+  <rect x="33" y="33" width="34" height="34" fill="#ffffff" fill-opacity="0.5"/>
+  <path d="M10 90 L50 10 L90 90 Z" fill="none" stroke="#202020" stroke-width="3"/>
+</svg>
+"""
+
+
+class Scenario(NamedTuple):
+    """One combination of code path, source & options to benchmark."""
+
+    path: str
+    fmt: str
+    size: int
+    transparent: bool
+    quality: str = DEFAULT_QUALITY
+
+    @property
+    def key(self) -> str:
+        """Identify the scenario across result files."""
+        background = "transparent" if self.transparent else "opaque"
+        return f"{self.path}/{self.fmt}/{self.size}/{background}/{self.quality}"
+
+
+def write_source(directory: Path, fmt: str, size: int) -> Path:
+    """Write a synthetic square source image, if it doesn't exist yet."""
+    path = directory / f"source-{size}.{fmt}"
+    if not path.exists():
+        if fmt == "svg":
+            path.write_text(SVG.format(size=size))
+        else:
+            image = synthetic_source((size, size))
+            # JPEG has no alpha channel; TIFF is written uncompressed.
+            (image.convert("RGB") if fmt == "jpg" else image).save(path)
+    return path
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Get the nearest-rank percentile of values."""
+    ordered = sorted(values)
+    rank = max(math.ceil(pct / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+def generate_once(scenario: Scenario, source: Path, output: Path) -> float:
+    """Generate one favicon set, returning its wall time in seconds."""
+    options = {"transparent": scenario.transparent, "quality": scenario.quality}
+    start = time.perf_counter()
+    if scenario.path == "sync":
+        with Favicons(source, output, **options) as favicons:
+            favicons.generate()
+    elif scenario.path == "async":
+
+        async def generate() -> None:
+            async with Favicons(source, output, **options) as favicons:
+                await favicons.generate()
+
+        asyncio.run(generate())
+    else:
+        transparent = "--transparent" if scenario.transparent else "--no-transparent"
+        subprocess.run(  # noqa: S603
+            [sys.executable, "-m", "favicons.cli", "generate", "--source", str(source)]
+            + ["--output-directory", str(output), transparent, "--quality", scenario.quality],
+            cwd=ROOT,
+            capture_output=True,
+            check=True,
+        )
+    return time.perf_counter() - start
+
+
+def peak_rss(scenario: Scenario) -> int:
+    """Get the peak resident memory, in bytes, of whichever process generated favicons."""
+    who = resource.RUSAGE_CHILDREN if scenario.path == "cli" else resource.RUSAGE_SELF
+    peak = resource.getrusage(who).ru_maxrss
+    # Reported in bytes on macOS, & in KiB elsewhere.
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def run_scenario(scenario: Scenario, source: Path, runs: int) -> Dict[str, Any]:
+    """Generate a scenario's favicon set once to warm up, then `runs` more times."""
+    with tempfile.TemporaryDirectory() as directory:
+        output = Path(directory)
+        generate_once(scenario, source, output)
+        latencies = [generate_once(scenario, source, output) for _ in range(runs)]
+        sizes = [p.stat().st_size for p in output.iterdir() if p.is_file()]
+
+    return {
+        **scenario._asdict(),
+        "key": scenario.key,
+        "runs": runs,
+        "icons": len(sizes),
+        "icons_per_sec": len(sizes) * runs / sum(latencies),
+        "mean_ms": sum(latencies) / runs * 1000,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "peak_rss_bytes": peak_rss(scenario),
+        "output_bytes": sum(sizes),
+    }
+
+
+def run_isolated(scenario: Scenario, source: Path, runs: int) -> Dict[str, Any]:
+    """Run a scenario in a fresh process."""
+    args = ["--scenario", json.dumps(scenario._asdict()), "--source", str(source)]
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, __file__, *args, "--runs", str(runs)],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    record: Dict[str, Any] = json.loads(result.stdout)
+    return record
+
+
+def environment() -> Dict[str, Any]:
+    """Describe what was benchmarked, so results from different versions can be compared."""
+    try:
+        version = metadata.version("favicons")
+    except metadata.PackageNotFoundError:
+        version = "unknown"
+    try:
+        commit: Optional[str] = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],  # noqa: S603, S607
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "favicons": version,
+        "commit": commit,
+        "python": platform.python_version(),
+        "pillow": PIL.__version__,
+        "platform": platform.platform(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+
+
+def describe(record: Dict[str, Any], baseline: Optional[Dict[str, Any]]) -> str:
+    """Summarize a scenario's results on one line."""
+    line = (
+        f"{record['key']:<37} {record['icons_per_sec']:8.1f} icons/s"
+        f"  p50 {record['p50_ms']:8.1f}ms  p99 {record['p99_ms']:8.1f}ms"
+        f"  peak {record['peak_rss_bytes'] / 2**20:7.1f}MiB  {record['output_bytes']:>9,}B"
+    )
+    if baseline is not None:
+        line += f"  ({record['icons_per_sec'] / baseline['icons_per_sec'] - 1:+.1%} vs baseline)"
+    return line
+
+
+def csv(value: str) -> List[str]:
+    """Split a comma-separated argument."""
+    return [v.strip() for v in value.split(",") if v.strip()]
+
+
+def main() -> int:
+    """Run every selected scenario, print a summary & save results."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--paths", type=csv, default=list(PATHS), help="sync, async and/or cli")
+    parser.add_argument("--formats", type=csv, default=list(FORMATS), help="Source formats")
+    parser.add_argument(
+        "--sizes", type=csv, default=[str(s) for s in SIZES], help="Source sizes, in pixels"
+    )
+    parser.add_argument(
+        "--transparency", choices=("both", "on", "off"), default="both", help="Backgrounds"
+    )
+    parser.add_argument(
+        "--qualities", type=csv, default=[DEFAULT_QUALITY], help=", ".join(QUALITY_PRESETS)
+    )
+    parser.add_argument("--runs", type=int, default=RUNS, help="Timed runs per scenario")
+    parser.add_argument("--output", type=Path, default=None, help="Write results as JSON")
+    parser.add_argument("--baseline", type=Path, default=None, help="Compare with results JSON")
+    # Internal: run a single scenario in this process & print its results.
+    parser.add_argument("--scenario", default=None, help=argparse.SUPPRESS)
+    parser.add_argument("--source", type=Path, default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.scenario is not None:
+        scenario = Scenario(**json.loads(args.scenario))
+        print(json.dumps(run_scenario(scenario, args.source, args.runs)))
+        return 0
+
+    transparency = {"both": (True, False), "on": (True,), "off": (False,)}[args.transparency]
+    baseline = {}
+    if args.baseline is not None:
+        baseline = {r["key"]: r for r in json.loads(args.baseline.read_text())["results"]}
+
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for fmt in args.formats:
+            for size in (int(s) for s in args.sizes):
+                source = write_source(Path(directory), fmt, size)
+                for path in args.paths:
+                    for transparent in transparency:
+                        for quality in args.qualities:
+                            scenario = Scenario(path, fmt, size, transparent, quality)
+                            record = run_isolated(scenario, source, args.runs)
+                            results.append(record)
+                            print(describe(record, baseline.get(record["key"])), flush=True)
+
+    if args.output is not None:
+        report = {"environment": environment(), "results": results}
+        args.output.write_text(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,108 @@
+"""Measure import & CLI startup time, and check heavy dependencies stay unimported.
+
+Run with `python benchmarks/import_time.py [--budget-ms N]`. Exits non-zero if a scenario
+imports a module it shouldn't need (Pillow or tarfile for `names`, for instance), or if
+`--budget-ms` is given & a scenario's median wall time exceeds it.
+"""
+
+# Standard Library
+import sys
+import time
+import argparse
+import tempfile
+import statistics
+import subprocess
+from typing import List, Tuple
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Modules that are only needed to decode, render, or draw progress output.
+HEAVY_MODULES = ("PIL", "svglib", "reportlab", "rich", "asyncio", "multiprocessing")
+
+# Standard library modules that are only needed to write files or archives, or to run batches,
+# watchers & spool workers.
+DEFERRED_MODULES = ("csv", "tarfile", "zipfile", "tempfile", "queue", "datetime", "socket")
+
+RUNS = 7
+
+
+def scenarios(source: Path) -> List[Tuple[str, List[str], Tuple[str, ...]]]:
+    """Get each scenario's name, the Python arguments that run it & heavy modules it may use."""
+    options = ["--source", str(source), "--output-directory", str(source.parent)]
+    # Click's parameter types use datetime.
+    typer = ("datetime",)
+    return [
+        ("import favicons", ["-c", "import favicons"], ()),
+        # Typer formats help with rich, & looks up its package metadata.
+        ("favicons --help", ["-m", "favicons.cli", "--help"], ("rich", *DEFERRED_MODULES)),
+        ("favicons names", ["-m", "favicons.cli", "names", *options], typer),
+        ("favicons html", ["-m", "favicons.cli", "html", *options], typer),
+        ("favicons json", ["-m", "favicons.cli", "json", *options], typer),
+    ]
+
+
+def imported_modules(args: List[str]) -> List[str]:
+    """Get the top-level packages a Python invocation imports, from `-X importtime`."""
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-X", "importtime", *args],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    modules = set()
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            name = line.rsplit("|", 1)[1].strip()
+            modules.add(name.split(".")[0])
+    return sorted(modules)
+
+
+def wall_time(args: List[str]) -> float:
+    """Get the median wall time of a Python invocation, in milliseconds."""
+    times = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        subprocess.run(  # noqa: S603
+            [sys.executable, *args], cwd=ROOT, capture_output=True, check=True
+        )
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+
+def main() -> int:
+    """Time each scenario & check which heavy modules it imports."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--budget-ms", type=float, default=None, help="Max median wall time")
+    budget = parser.parse_args().budget_ms
+
+    baseline = wall_time(["-c", "pass"])
+    print(f"python startup: {baseline:.1f}ms")
+    failed = False
+
+    with tempfile.TemporaryDirectory() as directory:
+        # Never decoded: naming commands only need the source to exist.
+        source = Path(directory) / "logo.png"
+        source.write_bytes(b"")
+
+        for name, args, allowed in scenarios(source):
+            heavy = [
+                m
+                for m in imported_modules(args)
+                if m in (*HEAVY_MODULES, *DEFERRED_MODULES) and m not in allowed
+            ]
+            elapsed = wall_time(args)
+            over = budget is not None and elapsed > budget
+            status = "FAIL" if heavy or over else "ok"
+            failed = failed or status == "FAIL"
+            print(
+                f"{name}: {elapsed:.1f}ms ({elapsed - baseline:+.1f}ms over startup) [{status}]"
+                + (f" imports {', '.join(heavy)}" if heavy else "")
+            )
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
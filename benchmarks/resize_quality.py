@@ -0,0 +1,86 @@
+"""Compare cascading pyramid resizes against `Image.thumbnail` from the full-size source.
+
+Run with `python benchmarks/resize_quality.py`. Exits non-zero if any output size drifts
+visibly from what a per-size `thumbnail()` call produces.
+"""
+
+# Standard Library
+import sys
+import math
+import time
+from typing import List, Tuple
+
+# Third Party
+from PIL import Image, ImageDraw, ImageStat, ImageChops
+
+# Project
+from favicons._resize import ResizePyramid
+from favicons._constants import ICON_TYPES
+
+# Minimum acceptable peak signal-to-noise ratio, in dB. Above ~40dB differences are invisible.
+MIN_PSNR = 40.0
+
+SOURCE_SIZES = ((512, 512), (1200, 900), (4000, 4000), (4001, 2999))
+
+
+def synthetic_source(size: Tuple[int, int]) -> Image.Image:
+    """Draw a logo-like RGBA image with hard edges, gradients & partial transparency."""
+    width, height = size
+    image = Image.new("RGBA", size, (0, 0, 0, 0))
+    draw = ImageDraw.Draw(image)
+    for i in range(0, width, max(width // 64, 1)):
+        draw.line((i, 0, width - i, height), fill=(i % 256, 80, 255 - i % 256, 255), width=3)
+    draw.ellipse((width // 8, height // 8, width * 7 // 8, height * 7 // 8), fill=(200, 30, 60))
+    draw.rectangle((width // 3, height // 3, width * 2 // 3, height * 2 // 3), fill=(20, 100, 220))
+    draw.rectangle((0, 0, width // 4, height // 4), fill=(255, 255, 255, 128))
+    return image
+
+
+def flatten(image: Image.Image) -> Image.Image:
+    """Composite onto gray, so the color of fully transparent pixels doesn't count."""
+    background = Image.new("RGBA", image.size, (128, 128, 128, 255))
+    return Image.alpha_composite(background, image).convert("RGB")
+
+
+def psnr(a: Image.Image, b: Image.Image) -> float:
+    """Get the peak signal-to-noise ratio between two same-sized RGBA images, as displayed."""
+    mse = sum(v**2 for v in ImageStat.Stat(ImageChops.difference(flatten(a), flatten(b))).rms) / 3
+    if mse == 0:
+        return math.inf
+    return 20 * math.log10(255 / math.sqrt(mse))
+
+
+def main() -> int:
+    """Check every ICON_TYPES size for each synthetic source."""
+    targets: List[Tuple[int, int]] = [t["dimensions"] for t in ICON_TYPES]
+    failed = False
+
+    for size in SOURCE_SIZES:
+        master = synthetic_source(size)
+
+        start = time.perf_counter()
+        expected = []
+        for target in targets:
+            thumb = master.copy()
+            thumb.thumbnail(target)
+            expected.append(thumb)
+        thumbnail_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        pyramid = ResizePyramid(master, targets)
+        actual = [pyramid.resize(target) for target in targets]
+        pyramid_time = time.perf_counter() - start
+
+        worst = min(psnr(e, a) for e, a in zip(expected, actual, strict=True))
+        status = "ok" if worst >= MIN_PSNR else "FAIL"
+        failed = failed or worst < MIN_PSNR
+        print(
+            f"{size[0]}x{size[1]}: worst PSNR {worst:.1f}dB [{status}] "
+            f"thumbnail {thumbnail_time * 1000:.1f}ms, pyramid {pyramid_time * 1000:.1f}ms"
+        )
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,16 +1,84 @@
 """Favicon generator for Python."""
 
+# Standard Library
+from typing import TYPE_CHECKING, Any, List
+from importlib import import_module
+
 # Project
+from favicons._sinks import Sink, TarSink, ZipSink, MemorySink, DirectorySink
+from favicons._metrics import Metrics
 from favicons._generate import Favicons
+from favicons._icon_sets import IconSet, register_icon_set
 from favicons._exceptions import (
     FaviconsError,
     FaviconColorError,
     FaviconNotFoundError,
     FaviconNotSupportedError,
 )
+from favicons._fingerprint import prune_fingerprints
+from favicons._source_cache import SourceCache, get_source_cache
+
+if TYPE_CHECKING:
+    # Project
+    from favicons._batch import BatchItem, BatchResult, read_manifest, generate_batch
+    from favicons._serve import IconCache, FaviconServer
+    from favicons._watch import Watcher, WatchCycle
+    from favicons._worker import JobResult, SpoolWorker, submit_job
+
+# Exports whose modules are imported on first use, so `import favicons` stays fast.
+_LAZY_EXPORTS = {
+    "FaviconServer": "favicons._serve",
+    "IconCache": "favicons._serve",
+    "Watcher": "favicons._watch",
+    "WatchCycle": "favicons._watch",
+    "BatchItem": "favicons._batch",
+    "BatchResult": "favicons._batch",
+    "read_manifest": "favicons._batch",
+    "generate_batch": "favicons._batch",
+    "SpoolWorker": "favicons._worker",
+    "JobResult": "favicons._worker",
+    "submit_job": "favicons._worker",
+}
+
+
+def __getattr__(name: str) -> Any:
+    """Import a lazily exported name."""
+    if name not in _LAZY_EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(_LAZY_EXPORTS[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    """List module attributes, including lazy exports."""
+    return sorted({*globals(), *_LAZY_EXPORTS})
+
 
 __all__ = (
     "Favicons",
+    "IconSet",
+    "register_icon_set",
+    "prune_fingerprints",
+    "Metrics",
+    "SourceCache",
+    "get_source_cache",
+    "FaviconServer",
+    "IconCache",
+    "Watcher",
+    "WatchCycle",
+    "Sink",
+    "DirectorySink",
+    "MemorySink",
+    "ZipSink",
+    "TarSink",
+    "BatchItem",
+    "BatchResult",
+    "read_manifest",
+    "generate_batch",
+    "SpoolWorker",
+    "JobResult",
+    "submit_job",
     "FaviconsError",
     "FaviconNotFoundError",
     "FaviconColorError",
@@ -0,0 +1,263 @@
+"""Generate favicon sets for many sources in one process."""
+
+# Standard Library
+import csv
+import json as _json
+import shutil
+from typing import (
+    Any,
+    Set,
+    Dict,
+    List,
+    Tuple,
+    Union,
+    Iterable,
+    Optional,
+    Generator,
+    NamedTuple,
+)
+from pathlib import Path
+
+# Project
+from favicons._util import hash_file, validate_path
+from favicons._types import Color
+from favicons._generate import Favicons, LoosePath
+from favicons._exceptions import FaviconsError
+
+MANIFEST_FIELDS = ("source", "output_directory", "background_color", "transparent", "base_url")
+
+
+class BatchItem(NamedTuple):
+    """A single favicon set to generate."""
+
+    source: str
+    output_directory: str
+    background_color: str = "#000000"
+    transparent: bool = True
+    base_url: str = "/"
+
+    @property
+    def key(self) -> Tuple[str, str]:
+        """Identify an item in a report."""
+        return (self.source, self.output_directory)
+
+
+class BatchResult(NamedTuple):
+    """Outcome of a single batch item."""
+
+    item: BatchItem
+    status: str
+    error: Optional[Dict] = None
+    duplicate_of: Optional[str] = None
+
+    def dict(self) -> Dict:
+        """Represent result as a report record."""
+        return {
+            "source": self.item.source,
+            "output_directory": self.item.output_directory,
+            "status": self.status,
+            "error": self.error,
+            "duplicate_of": self.duplicate_of,
+        }
+
+
+def _to_bool(value: Union[str, bool]) -> bool:
+    """Parse a manifest boolean."""
+    if isinstance(value, bool):
+        return value
+    return value.strip().lower() not in ("0", "false", "no", "off", "")
+
+
+def _parse_row(row: Dict[str, Any], base: Path) -> BatchItem:
+    """Create a batch item from a manifest row, resolving paths relative to the manifest."""
+    if not isinstance(row, dict):
+        raise FaviconsError("Manifest row {row} isn't an object.", row=row)
+    row = {k: v for k, v in row.items() if v not in (None, "")}
+    if "color" in row and "background_color" not in row:
+        row["background_color"] = row.pop("color")
+    missing = [f for f in ("source", "output_directory") if f not in row]
+    if missing:
+        raise FaviconsError("Manifest row {row} is missing {missing}.", row=row, missing=missing)
+    row["source"] = str(base / row["source"])
+    row["output_directory"] = str(base / row["output_directory"])
+    if "transparent" in row:
+        row["transparent"] = _to_bool(row["transparent"])
+    return BatchItem(**{k: v for k, v in row.items() if k in MANIFEST_FIELDS})
+
+
+def _invalid_row(row: Any, base: Path, line: int, err: Exception) -> BatchResult:
+    """Record a manifest row that couldn't be parsed, identified as well as it can be."""
+    fields = row if isinstance(row, dict) else {}
+    source, output_directory = (fields.get(f) for f in ("source", "output_directory"))
+    item = BatchItem(
+        source=str(base / source) if isinstance(source, str) and source else "",
+        output_directory=(
+            str(base / output_directory)
+            if isinstance(output_directory, str) and output_directory
+            else ""
+        ),
+    )
+    error = FaviconsError("Manifest line {line} is invalid: {error}", line=line, error=str(err))
+    return BatchResult(item, "error", _error(error))
+
+
+def read_manifest(manifest: LoosePath) -> Generator[Union[BatchItem, BatchResult], None, None]:
+    """Read batch items from a CSV (with a header row) or JSON Lines manifest.
+
+    Relative `source` & `output_directory` paths are relative to the manifest file. A row that
+    can't be parsed is yielded as an `error` result, so it's reported without ending the batch.
+    """
+    path = validate_path(manifest)
+    base = path.parent
+
+    with path.open(newline="") as f:
+        if path.suffix.lower() == ".csv":
+            reader = csv.DictReader(f)
+            for row in reader:
+                try:
+                    yield _parse_row(row, base)
+                except FaviconsError as err:
+                    yield _invalid_row(row, base, reader.line_num, err)
+        elif path.suffix.lower() in (".jsonl", ".ndjson"):
+            for number, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                row = None
+                try:
+                    row = _json.loads(line)
+                    yield _parse_row(row, base)
+                except (ValueError, FaviconsError) as err:
+                    yield _invalid_row(row, base, number, err)
+        else:
+            raise FaviconsError("Manifest {file} must be a .csv or .jsonl file.", file=str(path))
+
+
+def _read_report(report: Path) -> Set[Tuple[str, str]]:
+    """Get the keys of items a previous run completed successfully."""
+    done = set()
+    if report.exists():
+        with report.open() as f:
+            for line in f:
+                try:
+                    record = _json.loads(line)
+                except ValueError:
+                    # The last line may be truncated if the previous run was killed.
+                    continue
+                if record.get("status") == "ok":
+                    done.add((record["source"], record["output_directory"]))
+    return done
+
+
+def _error(err: Exception) -> Dict:
+    """Represent an exception as a report error."""
+    if isinstance(err, FaviconsError):
+        return {"type": err.__class__.__name__, **err.dict()}
+    return {"type": err.__class__.__name__, "message": str(err)}
+
+
+def _generate_group(items: Tuple[BatchItem, ...]) -> List[BatchResult]:
+    """Generate a favicon set once, then copy it to every item sharing the same output.
+
+    Runs in a worker process.
+    """
+    first, *duplicates = items
+    try:
+        with Favicons(
+            source=first.source,
+            output_directory=first.output_directory,
+            background_color=first.background_color,
+            transparent=first.transparent,
+            base_url=first.base_url,
+        ) as favicons:
+            favicons.sgenerate()
+            filenames = favicons.filenames()
+    except Exception as err:
+        return [BatchResult(item, "error", _error(err)) for item in items]
+
+    results = [BatchResult(first, "ok")]
+    src_dir = Path(first.output_directory)
+    for item in duplicates:
+        try:
+            dst_dir = Path(item.output_directory)
+            # A repeated row already has its favicons, & copying a file onto itself fails.
+            if dst_dir.resolve() != src_dir.resolve():
+                dst_dir.mkdir(parents=True, exist_ok=True)
+                for filename in filenames:
+                    shutil.copyfile(src_dir / filename, dst_dir / filename)
+            results.append(BatchResult(item, "ok", duplicate_of=first.source))
+        except Exception as err:
+            results.append(BatchResult(item, "error", _error(err)))
+    return results
+
+
+def _group_items(
+    items: Iterable[BatchItem],
+) -> Tuple[List[Tuple[BatchItem, ...]], List[BatchResult]]:
+    """Group items whose sources & render options are identical."""
+    groups: Dict[Tuple[str, ...], List[BatchItem]] = {}
+    failed = []
+    for item in items:
+        try:
+            key = (
+                hash_file(validate_path(item.source)),
+                Color(item.background_color).as_hex(),
+                str(item.transparent),
+            )
+        except (OSError, FaviconsError) as err:
+            failed.append(BatchResult(item, "error", _error(err)))
+            continue
+        groups.setdefault(key, []).append(item)
+    return [tuple(g) for g in groups.values()], failed
+
+
+def generate_batch(
+    items: Iterable[Union[BatchItem, BatchResult]],
+    report: LoosePath,
+    workers: Optional[int] = None,
+    resume: bool = False,
+) -> Generator[BatchResult, None, None]:
+    """Generate favicon sets for many items on a process pool, yielding results as they finish.
+
+    Items with byte-identical sources & the same color options are only rendered once; the
+    other items receive copies of the output. Each result is appended to `report` as a JSON
+    line as soon as it's known. With `resume`, items already recorded as `ok` in an existing
+    report are skipped. Results among `items`, such as rows `read_manifest` couldn't parse, are
+    recorded as they are.
+    """
+    # Standard Library
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    report = validate_path(report, must_exist=False, create=True)
+    done = _read_report(report) if resume else set()
+
+    pending = []
+    invalid = []
+    for item in items:
+        if isinstance(item, BatchResult):
+            invalid.append(item)
+        elif item.key in done:
+            yield BatchResult(item, "skipped")
+        else:
+            pending.append(item)
+
+    groups, failed = _group_items(pending)
+
+    with report.open("a" if resume else "w") as log:
+
+        def record(result: BatchResult) -> BatchResult:
+            log.write(_json.dumps(result.dict(), default=str) + "\n")
+            log.flush()
+            return result
+
+        for result in (*invalid, *failed):
+            yield record(result)
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(_generate_group, group) for group in groups]
+            try:
+                for future in as_completed(futures):
+                    for result in future.result():
+                        yield record(result)
+            finally:
+                for future in futures:
+                    future.cancel()
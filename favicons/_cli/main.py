@@ -1,35 +1,116 @@
 """Favicons CLI Commands."""
 
 # Standard Library
+import sys
+import json as _json
+import time
+from typing import TYPE_CHECKING, List, Tuple, Union, Optional
 from pathlib import Path
+from functools import lru_cache
+from collections import Counter
 
 # Third Party
-from typer import Typer, Option
-from rich.panel import Panel
-from rich.columns import Columns
-from rich.console import Console
-from rich.progress import track
+from typer import Typer, Option, echo, style
 
 # Project
+from favicons._resize import QUALITY_PRESETS
+from favicons._metrics import Metrics
 from favicons._generate import Favicons
+from favicons._fingerprint import prune_fingerprints
 from favicons._types.properties import FaviconProperties
 
+if TYPE_CHECKING:
+    # Third Party
+    from rich.table import Table
+    from rich.console import Console
+
 cli = Typer(name="Favicons", add_completion=False)
-console = Console()
 
 DEFAULT_OUTPUT_PATH = Path.cwd()
 
 
-def item_name(item: FaviconProperties) -> str:
+@lru_cache(maxsize=None)
+def get_console(stderr: bool = False) -> "Console":
+    """Get a rich console, importing rich only for the commands that draw with it."""
+    # Third Party
+    from rich.console import Console
+
+    return Console(stderr=stderr)
+
+
+def item_name(item: Union[FaviconProperties, str]) -> str:
     """Format favicon name."""
     return f"[bold green]{str(item)}[/bold green]"
 
 
+def profile_tables(metrics: Metrics, elapsed: float) -> "Tuple[Table, Table]":
+    """Tabulate time spent in each pipeline stage & bytes written in each image format."""
+    # Third Party
+    from rich.table import Table
+
+    data = metrics.dict()
+    stages = Table(title=f"Profile ({elapsed * 1000:,.1f} ms wall time)", title_justify="left")
+    for column in ("Stage", "Calls", "Total ms", "Mean ms", "Max ms", "Share"):
+        stages.add_column(column, justify="left" if column == "Stage" else "right")
+    busy = sum(s["total"] for s in data["stages"].values()) or 1
+    for stage, s in data["stages"].items():
+        stages.add_row(
+            stage,
+            str(s["calls"]),
+            f"{s['total'] * 1000:,.1f}",
+            f"{s['mean'] * 1000:,.2f}",
+            f"{s['max'] * 1000:,.2f}",
+            f"{s['total'] / busy:.0%}",
+        )
+
+    outputs = Table(title="Output", title_justify="left")
+    for column in ("Format", "Files", "Bytes"):
+        outputs.add_column(column, justify="left" if column == "Format" else "right")
+    for image_fmt, size in data["bytes"].items():
+        outputs.add_row(image_fmt, str(data["files"][image_fmt]), f"{size:,}")
+    return stages, outputs
+
+
 DEFAULT_SOURCE = Option(..., help="Source Image")
 DEFAULT_OUTPUT_DIR = Option(DEFAULT_OUTPUT_PATH, help="Output Directory")
 DEFAULT_BG = Option("#000000", help="Background Color")
 DEFAULT_TRANSPARENT = Option(True, help="Transparent Background")
 DEFAULT_BASE_URL = Option("/", help="Base URL for HTML output")
+DEFAULT_JOBS = Option(1, help="Number of formats to generate in parallel")
+DEFAULT_OPTIMIZE = Option(
+    0, help="Optimization level: 0 none, 1 lossless, 2 near-lossless palette quantization"
+)
+DEFAULT_VARIANTS = Option(
+    [], "--variant", help="Also generate each PNG icon as webp or avif (may be repeated)"
+)
+DEFAULT_FINGERPRINT = Option(False, help="Embed a content hash in each file name")
+DEFAULT_PRUNE = Option(False, help="Delete fingerprinted files left over from previous runs")
+DEFAULT_MEMORY_BUDGET = Option(
+    None, help="Decode the source within this many MiB, at a reduced size where possible"
+)
+DEFAULT_QUALITY = Option(
+    "balanced", help=f"Resampling quality: {', '.join(QUALITY_PRESETS)} (fastest first)"
+)
+DEFAULT_PROFILE = Option(False, help="Print time spent in each pipeline stage")
+DEFAULT_PROFILE_OUTPUT = Option(
+    None, help="Also write the profile as JSON (.json) or cProfile stats (any other extension)"
+)
+DEFAULT_INCREMENTAL = Option(False, help="Skip formats whose source & options are unchanged")
+DEFAULT_ARCHIVE = Option(
+    None, help="Write a .zip, .tar, .tar.gz or .tgz archive instead of files ('-.zip' for stdout)"
+)
+DEFAULT_INTERVAL = Option(0.25, help="Seconds between checks of the source")
+DEFAULT_DEBOUNCE = Option(0.2, help="Seconds the source must stay unchanged before regenerating")
+DEFAULT_MANIFEST = Option(..., help="Manifest of sources (CSV or JSONL)")
+DEFAULT_REPORT = Option(Path("favicons-report.jsonl"), help="Per-item JSONL result report")
+DEFAULT_WORKERS = Option(None, help="Worker processes [default: CPU count]")
+DEFAULT_RESUME = Option(False, help="Skip items already completed in an existing report")
+DEFAULT_SPOOL = Option(..., help="Spool directory of .job files, shared between workers")
+DEFAULT_POLL_INTERVAL = Option(1.0, help="Seconds between checks of an empty spool")
+DEFAULT_STALE_AFTER = Option(
+    300.0, help="Seconds after which a claim its worker stopped touching is run again"
+)
+DEFAULT_DRAIN = Option(False, help="Exit once the spool is empty, instead of waiting for jobs")
 
 
 @cli.command()
@@ -39,8 +120,36 @@ def generate(
     background_color: str = DEFAULT_BG,
     transparent: bool = DEFAULT_TRANSPARENT,
     base_url: str = DEFAULT_BASE_URL,
+    variants: List[str] = DEFAULT_VARIANTS,
+    fingerprint: bool = DEFAULT_FINGERPRINT,
+    jobs: int = DEFAULT_JOBS,
+    archive: Optional[str] = DEFAULT_ARCHIVE,
+    incremental: bool = DEFAULT_INCREMENTAL,
+    optimize: int = DEFAULT_OPTIMIZE,
+    prune: bool = DEFAULT_PRUNE,
+    memory_budget: Optional[int] = DEFAULT_MEMORY_BUDGET,
+    quality: str = DEFAULT_QUALITY,
+    profile: bool = DEFAULT_PROFILE,
+    profile_output: Optional[Path] = DEFAULT_PROFILE_OUTPUT,
 ) -> None:
     """Generate Favicons"""  # noqa: D400
+    # Third Party
+    from rich.panel import Panel
+    from rich.columns import Columns
+    from rich.progress import track
+
+    sink = None
+    output = get_console()
+    if archive is not None:
+        # Project
+        from favicons._sinks import archive_sink
+
+        if archive.startswith("-"):
+            # Keep stdout clean for the archive stream.
+            sink = archive_sink(sys.stdout.buffer, name=archive)
+            output = get_console(stderr=True)
+        else:
+            sink = archive_sink(Path(archive))
 
     favicons = Favicons(
         source=source,
@@ -48,21 +157,118 @@ def generate(
         background_color=background_color,
         transparent=transparent,
         base_url=base_url,
+        variants=variants,
+        fingerprint=fingerprint,
+        jobs=jobs,
+        sink=sink,
+        incremental=incremental,
+        optimize=optimize,
+        memory_budget=None if memory_budget is None else memory_budget << 20,
+        metrics=Metrics() if profile or profile_output else None,
+        quality=quality,
     )
 
-    favicons._validate()
-    for fmt in track(
-        favicons._formats,
+    profiler = None
+    if profile_output is not None and profile_output.suffix != ".json":
+        # Standard Library
+        import cProfile
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+
+    start = time.perf_counter()
+    for _ in track(
+        favicons.sgenerate_iter(),
         description="Generating Favicons...",
         total=len(favicons._formats),
-        console=console,
+        console=output,
     ):
-        favicons._generate_single(fmt)
+        pass
+    elapsed = time.perf_counter() - start
+
+    if profiler is not None and profile_output is not None:
+        profiler.disable()
+        profiler.dump_stats(profile_output)
+
+    if prune and sink is None and favicons.output_directory is not None:
+        prune_fingerprints(favicons.output_directory)
 
-    generated = [Panel(item_name(f), expand=True) for f in favicons._formats]
+    generated = [Panel(item_name(f), expand=True) for f in favicons.filenames()]
 
-    console.print(f"\n[green]Generated [b]{favicons.completed}[/b] icons:[/green]\n")
-    console.print(Columns(generated))
+    skipped = f", skipped [b]{favicons.skipped}[/b] unchanged" if favicons.skipped else ""
+    saved = f", saved [b]{favicons.bytes_saved:,}[/b] bytes" if optimize else ""
+    output.print(f"\n[green]Generated [b]{favicons.completed}[/b] icons{skipped}{saved}:[/green]\n")
+    output.print(Columns(generated))
+
+    if favicons.metrics is not None:
+        output.print()
+        output.print(*profile_tables(favicons.metrics, elapsed))
+        if profile_output is not None and profiler is None:
+            profile_output.write_text(
+                _json.dumps({"elapsed": elapsed, **favicons.metrics.dict()}, indent=2)
+            )
+
+
+@cli.command()
+def watch(
+    source: Path = DEFAULT_SOURCE,
+    output_directory: Path = DEFAULT_OUTPUT_DIR,
+    background_color: str = DEFAULT_BG,
+    transparent: bool = DEFAULT_TRANSPARENT,
+    base_url: str = DEFAULT_BASE_URL,
+    variants: List[str] = DEFAULT_VARIANTS,
+    fingerprint: bool = DEFAULT_FINGERPRINT,
+    jobs: int = DEFAULT_JOBS,
+    optimize: int = DEFAULT_OPTIMIZE,
+    prune: bool = DEFAULT_PRUNE,
+    memory_budget: Optional[int] = DEFAULT_MEMORY_BUDGET,
+    quality: str = DEFAULT_QUALITY,
+    interval: float = DEFAULT_INTERVAL,
+    debounce: float = DEFAULT_DEBOUNCE,
+) -> None:
+    """Regenerate favicons whenever the source changes."""
+    # Third Party
+    from rich.markup import escape
+
+    # Project
+    from favicons._watch import Watcher
+
+    console = get_console()
+    watcher = Watcher(
+        source=source,
+        output_directory=output_directory,
+        interval=interval,
+        debounce=debounce,
+        jobs=jobs,
+        prune=prune,
+        background_color=background_color,
+        transparent=transparent,
+        base_url=base_url,
+        variants=variants,
+        fingerprint=fingerprint,
+        optimize=optimize,
+        memory_budget=None if memory_budget is None else memory_budget << 20,
+        quality=quality,
+    )
+    console.print(f"Watching [b]{source}[/b] (Ctrl+C to stop)")
+    try:
+        with watcher:
+            for cycle in watcher.watch():
+                prefix = f"{time.strftime('%H:%M:%S')} "
+                latency = f"{cycle.elapsed * 1000:.1f} ms"
+                if cycle.error is not None:
+                    error = escape(str(cycle.error))
+                    console.print(f"{prefix}[red]Failed in {latency}: {error}[/red]")
+                elif cycle.skipped:
+                    console.print(f"{prefix}Source contents unchanged, checked in {latency}")
+                else:
+                    written = len(cycle.written)
+                    console.print(
+                        f"{prefix}[green]Rewrote [b]{written}[/b] changed icons[/green] "
+                        f"({cycle.unchanged} unchanged) in {latency}"
+                    )
+    except KeyboardInterrupt:
+        console.print("Stopped watching.")
 
 
 @cli.command()
@@ -72,6 +278,8 @@ def json(
     background_color: str = DEFAULT_BG,
     transparent: bool = DEFAULT_TRANSPARENT,
     base_url: str = DEFAULT_BASE_URL,
+    variants: List[str] = DEFAULT_VARIANTS,
+    fingerprint: bool = DEFAULT_FINGERPRINT,
 ) -> None:
     """Get favicons as JSON."""
     with Favicons(
@@ -80,8 +288,10 @@ def json(
         background_color=background_color,
         transparent=transparent,
         base_url=base_url,
+        variants=variants,
+        fingerprint=fingerprint,
     ) as favicons:
-        console.print(favicons.json(indent=2))
+        echo(favicons.json(indent=2))
 
 
 @cli.command()
@@ -91,6 +301,8 @@ def names(
     background_color: str = DEFAULT_BG,
     transparent: bool = DEFAULT_TRANSPARENT,
     base_url: str = DEFAULT_BASE_URL,
+    variants: List[str] = DEFAULT_VARIANTS,
+    fingerprint: bool = DEFAULT_FINGERPRINT,
 ) -> None:
     """Get favicon file names."""
     with Favicons(
@@ -99,10 +311,12 @@ def names(
         background_color=background_color,
         transparent=transparent,
         base_url=base_url,
+        variants=variants,
+        fingerprint=fingerprint,
     ) as favicons:
         for icon in favicons.filenames_gen():
-            fname, ext = icon.split(".")
-            console.print(f"[bold yellow]{fname}[/bold yellow].[bold blue]{ext}[/bold blue]")
+            fname, _, ext = icon.rpartition(".")
+            echo(f"{style(fname, fg='yellow', bold=True)}.{style(ext, fg='blue', bold=True)}")
 
 
 @cli.command()
@@ -112,6 +326,8 @@ def html(
     background_color: str = DEFAULT_BG,
     transparent: bool = DEFAULT_TRANSPARENT,
     base_url: str = DEFAULT_BASE_URL,
+    variants: List[str] = DEFAULT_VARIANTS,
+    fingerprint: bool = DEFAULT_FINGERPRINT,
 ) -> None:
     """Get favicons as HTML."""
     with Favicons(
@@ -120,5 +336,92 @@ def html(
         background_color=background_color,
         transparent=transparent,
         base_url=base_url,
+        variants=variants,
+        fingerprint=fingerprint,
     ) as favicons:
-        console.print("\n".join(favicons.html_gen()))
+        echo("\n".join(favicons.html_gen()))
+
+
+@cli.command()
+def batch(
+    manifest: Path = DEFAULT_MANIFEST,
+    report: Path = DEFAULT_REPORT,
+    workers: Optional[int] = DEFAULT_WORKERS,
+    resume: bool = DEFAULT_RESUME,
+) -> None:
+    """Generate favicons for every source in a manifest."""
+    # Third Party
+    from rich.progress import track
+
+    # Project
+    from favicons._batch import read_manifest, generate_batch
+
+    console = get_console()
+    items = list(read_manifest(manifest))
+    counts: Counter = Counter()
+
+    for result in track(
+        generate_batch(items, report=report, workers=workers, resume=resume),
+        description="Generating Favicons...",
+        total=len(items),
+        console=console,
+    ):
+        counts[result.status] += 1
+
+    console.print(
+        f"\n[green]Generated [b]{counts['ok']}[/b] favicon sets[/green], "
+        f"skipped [b]{counts['skipped']}[/b], "
+        f"[red]failed [b]{counts['error']}[/b][/red]. Report: {report}"
+    )
+
+
+@cli.command()
+def worker(
+    spool: Path = DEFAULT_SPOOL,
+    workers: Optional[int] = DEFAULT_WORKERS,
+    poll_interval: float = DEFAULT_POLL_INTERVAL,
+    stale_after: float = DEFAULT_STALE_AFTER,
+    drain: bool = DEFAULT_DRAIN,
+) -> None:
+    """Generate favicons for jobs claimed from a spool directory."""
+    # Standard Library
+    import signal
+
+    # Third Party
+    from rich.markup import escape
+
+    # Project
+    from favicons._worker import SpoolWorker
+
+    console = get_console()
+    spool_worker = SpoolWorker(
+        spool, processes=workers, poll_interval=poll_interval, stale_after=stale_after, drain=drain
+    )
+
+    def shutdown(*_: object) -> None:
+        console.print("Stopping once running jobs finish...")
+        spool_worker.stop()
+
+    signal.signal(signal.SIGINT, shutdown)
+    signal.signal(signal.SIGTERM, shutdown)
+
+    console.print(f"Working on [b]{spool}[/b] with {spool_worker.processes} processes")
+    for result in spool_worker.run():
+        if result.status == "ok":
+            status = f"[green]ok[/green] in {result.elapsed * 1000:.1f} ms"
+        elif result.status == "error":
+            error = escape(str((result.error or {}).get("message", result.error)))
+            status = f"[red]failed[/red] in {result.elapsed * 1000:.1f} ms: {error}"
+        else:
+            status = "[yellow]stale claim recovered[/yellow]"
+        console.print(
+            f"{time.strftime('%H:%M:%S')} {result.job} {status} "
+            f"({spool_worker.stats.jobs_per_sec:.2f} jobs/s)"
+        )
+
+    stats = spool_worker.stats
+    console.print(
+        f"\n[green]Generated [b]{stats.ok}[/b] favicon sets[/green], "
+        f"[red]failed [b]{stats.failed}[/b][/red], recovered [b]{stats.recovered}[/b] stale "
+        f"claims in {stats.elapsed:.1f}s ({stats.jobs_per_sec:.2f} jobs/s)"
+    )
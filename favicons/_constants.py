@@ -4,6 +4,16 @@ SUPPORTED_FORMATS = (".svg", ".jpeg", ".jpg", ".png", ".tiff", ".tif")
 
 HTML_LINK = '<link rel="{rel}" type="{type}" href="{href}" />'
 
+# Image formats that can be generated alongside each PNG favicon.
+VARIANT_FORMATS = ("webp", "avif")
+
+# Link relations of the favicons that get variants. Apple touch icons must be PNGs, & tiles
+# aren't linked at all.
+VARIANT_RELS = ("icon", "shortcut icon")
+
+# Resolutions embedded in a favicon.ico, up to the size of its format.
+ICO_SIZES = ((16, 16), (32, 32), (48, 48), (64, 64))
+
 ICON_TYPES = (
     {"image_fmt": "ico", "rel": None, "dimensions": (64, 64), "prefix": "favicon"},
     {"image_fmt": "png", "rel": "icon", "dimensions": (16, 16), "prefix": "favicon"},
@@ -0,0 +1,151 @@
+"""Decode raster sources within a memory budget, straight to the size favicons are made from."""
+
+# Standard Library
+import math
+from typing import TYPE_CHECKING, List, Tuple, Iterable, Optional
+
+# Project
+from favicons._resize import Size, fit_size
+from favicons._exceptions import FaviconsError
+
+if TYPE_CHECKING:
+    # Third Party
+    from PIL import Image as PILImage
+    from PIL import ImageFile, TiffImagePlugin
+
+# Bytes per pixel of the RGBA image everything is converted to.
+RGBA_BYTES = 4
+
+# Modes reduced as they are decoded; anything else is converted to RGBA first.
+REDUCIBLE_MODES = ("L", "LA", "RGB", "RGBA")
+
+# TIFF tags describing how raw strips & tiles are laid out.
+BITS_PER_SAMPLE = 258
+SAMPLES_PER_PIXEL = 277
+PLANAR_CONFIGURATION = 284
+
+# A raw strip or tile: its extents in the image, file offset, raw mode & bytes per row.
+RawTile = Tuple[Tuple[int, int, int, int], int, str, int]
+
+
+def decoded_bytes(size: Size) -> int:
+    """Estimate the memory an RGBA image of size needs."""
+    return size[0] * size[1] * RGBA_BYTES
+
+
+def working_size(source: Size, targets: Iterable[Size], reducing_gap: float) -> Size:
+    """Get the smallest size to decode to: `reducing_gap` times the largest target."""
+    targets = tuple(targets)
+    largest = (max(t[0] for t in targets), max(t[1] for t in targets))
+    return fit_size(
+        source, (math.ceil(largest[0] * reducing_gap), math.ceil(largest[1] * reducing_gap))
+    )
+
+
+def reduced_size(size: Size, factor: int) -> Size:
+    """Get the size `Image.reduce` produces."""
+    return (math.ceil(size[0] / factor), math.ceil(size[1] / factor))
+
+
+def _raw_tiles(image: "TiffImagePlugin.TiffImageFile") -> Optional[List[RawTile]]:
+    """Get an uncompressed, chunky TIFF's strips or tiles & each row's length, if it is one."""
+    if not image.tile:
+        return None
+    if image.tag_v2.get(PLANAR_CONFIGURATION, 1) != 1:
+        return None
+
+    bits = image.tag_v2.get(BITS_PER_SAMPLE, 1)
+    if isinstance(bits, tuple):
+        pixel_bits = sum(bits)
+    else:
+        pixel_bits = bits * image.tag_v2.get(SAMPLES_PER_PIXEL, 1)
+
+    tiles: List[RawTile] = []
+    for codec, extents, offset, args in image.tile:
+        # Only top-down rows of raw samples can be read a band at a time.
+        if codec != "raw" or extents is None or not isinstance(args, tuple) or args[2:] != (1,):
+            return None
+        rawmode, stride = args[:2]
+        row_bytes = stride or math.ceil((extents[2] - extents[0]) * pixel_bits / 8)
+        tiles.append((extents, offset, rawmode, row_bytes))
+    return tiles
+
+
+def _reduce_raw(
+    image: "ImageFile.ImageFile", tiles: List[RawTile], factor: int, budget: int
+) -> "PILImage.Image":
+    """Decode raw strips or tiles a band of rows at a time, reducing each band by factor."""
+    # Third Party
+    from PIL import Image as PILImage
+
+    if image.fp is None:
+        raise FaviconsError("Source image is closed.")
+    reduced = PILImage.new("RGBA", reduced_size(image.size, factor))
+    for (x0, y0, x1, y1), offset, rawmode, stride in tiles:
+        # Each band is held as raw bytes, decoded & converted to RGBA, in half the budget.
+        row_bytes = stride + 2 * (x1 - x0) * RGBA_BYTES
+        rows = max(factor, budget // 2 // row_bytes // factor * factor)
+        for top in range(y0, y1, rows):
+            bottom = min(top + rows, y1)
+            image.fp.seek(offset + (top - y0) * stride)
+            data = image.fp.read((bottom - top) * stride)
+            band = PILImage.frombytes(
+                image.mode, (x1 - x0, bottom - top), data, "raw", rawmode, stride
+            )
+            reduced.paste(band.convert("RGBA").reduce(factor), (x0 // factor, top // factor))
+    return reduced
+
+
+def decode_bounded(
+    image: "ImageFile.ImageFile",
+    targets: Iterable[Size],
+    memory_budget: int,
+    reducing_gap: float = 2.0,
+) -> "PILImage.Image":
+    """Decode an opened image as a reduced RGBA master, within memory_budget bytes.
+
+    JPEGs are decoded at a reduced scale. Uncompressed TIFFs are read & reduced a band at a
+    time. Anything else is decoded whole, if it fits.
+    """
+    # Third Party
+    from PIL import TiffImagePlugin
+
+    size = working_size(image.size, targets, reducing_gap)
+
+    if image.format == "JPEG":
+        # Decodes at the smallest 1/8th scale that is still at least as large as size.
+        image.draft(None, size)
+
+    # Reduce by a whole factor, so the master stays at least `reducing_gap` times each target
+    # & the pyramid resamples it much as it would the full-size source.
+    factor = min(image.size[0] // size[0], image.size[1] // size[1])
+    # Decoding whole holds the decoded image & a full-size conversion at once.
+    needed = 2 * decoded_bytes(image.size)
+    tiles = None
+    if needed > memory_budget and isinstance(image, TiffImagePlugin.TiffImageFile):
+        tiles = _raw_tiles(image)
+    if tiles is not None:
+        # Bands have to start on a multiple of factor to line up in the reduced image.
+        factor = math.gcd(factor, *(c for t in tiles for c in t[0][:2]))
+        if factor > 1:
+            needed = decoded_bytes(reduced_size(image.size, factor))
+
+    if needed > memory_budget:
+        raise FaviconsError(
+            "Decoding {size} {format} source needs ~{needed} MiB, over the {budget} MiB memory "
+            "budget. Only JPEG & uncompressed TIFF sources can be decoded at a reduced size.",
+            size="x".join(str(d) for d in image.size),
+            format=image.format,
+            needed=needed >> 20,
+            budget=memory_budget >> 20,
+        )
+
+    if tiles is not None and factor > 1:
+        master = _reduce_raw(image, tiles, factor, memory_budget)
+    else:
+        image.load()
+        # Reduce in the decoded mode where possible, so only the reduced image is converted.
+        master = image if image.mode in REDUCIBLE_MODES else image.convert("RGBA")
+        if factor > 1:
+            master = master.reduce(factor)
+    return master.convert("RGBA")
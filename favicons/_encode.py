@@ -0,0 +1,104 @@
+"""Encode rendered favicons, optionally searching for the smallest encoding."""
+
+# Standard Library
+import math
+from io import BytesIO
+from typing import TYPE_CHECKING, Any, Dict, List, NamedTuple
+
+if TYPE_CHECKING:
+    # Third Party
+    from PIL import Image as PILImage
+
+# Optimization levels.
+OPTIMIZE_NONE = 0
+OPTIMIZE_LOSSLESS = 1
+OPTIMIZE_NEAR_LOSSLESS = 2
+
+# Minimum peak signal-to-noise ratio, in dB, for a near-lossless palette to be used. Above ~40dB
+# differences are invisible.
+NEAR_LOSSLESS_PSNR = 40.0
+
+# zlib level used when optimizing.
+OPTIMIZED_COMPRESS_LEVEL = 9
+
+# Encoder settings for each variant format.
+VARIANT_PARAMS: Dict[str, Dict[str, Any]] = {
+    "webp": {"quality": 90, "method": 4},
+    "avif": {"quality": 75, "speed": 6},
+}
+
+
+class Encoded(NamedTuple):
+    """An encoded favicon & the size it would have been without optimization."""
+
+    data: bytes
+    original_size: int
+
+    @property
+    def saved(self) -> int:
+        """Bytes saved by optimization."""
+        return self.original_size - len(self.data)
+
+
+def save(image: "PILImage.Image", image_fmt: str, **params: Any) -> bytes:
+    """Encode an image in memory."""
+    buffer = BytesIO()
+    image.save(buffer, image_fmt, **params)
+    return buffer.getvalue()
+
+
+def psnr(a: "PILImage.Image", b: "PILImage.Image") -> float:
+    """Get the peak signal-to-noise ratio between two images of the same size & mode."""
+    # Third Party
+    from PIL import ImageStat, ImageChops
+
+    rms = ImageStat.Stat(ImageChops.difference(a, b)).rms
+    mse = sum(v**2 for v in rms) / len(rms)
+    if mse == 0:
+        return math.inf
+    return 20 * math.log10(255 / math.sqrt(mse))
+
+
+def png_candidates(image: "PILImage.Image", optimize: int) -> List[bytes]:
+    """Encode alternatives to Pillow's default PNG encoding at an optimization level.
+
+    A new canvas is encoded with no `pnginfo`, ICC profile or EXIF, so no metadata is written.
+    """
+    # Third Party
+    from PIL import Image as PILImage
+
+    params = {"optimize": True, "compress_level": OPTIMIZED_COMPRESS_LEVEL}
+
+    # Drop the alpha channel if every pixel is opaque.
+    if image.mode == "RGBA" and image.getchannel("A").getextrema() == (255, 255):
+        image = image.convert("RGB")
+    candidates = [save(image, "png", **params)]
+
+    # Icons often have few enough colors for a palette, which is exact if the round trip is.
+    palette = image.quantize(256, method=PILImage.Quantize.FASTOCTREE)
+    error = psnr(palette.convert(image.mode), image)
+    if error == math.inf or (optimize >= OPTIMIZE_NEAR_LOSSLESS and error >= NEAR_LOSSLESS_PSNR):
+        candidates.append(save(palette, "png", **params))
+    return candidates
+
+
+def webp_candidates(image: "PILImage.Image") -> List[bytes]:
+    """Encode alternatives to the default WebP encoding: the slowest lossy method & lossless."""
+    return [
+        save(image, "webp", **{**VARIANT_PARAMS["webp"], "method": 6}),
+        save(image, "webp", lossless=True, quality=100, method=6),
+    ]
+
+
+def encode(image: "PILImage.Image", image_fmt: str, optimize: int = OPTIMIZE_NONE) -> Encoded:
+    """Encode a favicon, keeping the smallest candidate encoding if optimizing."""
+    data = save(image, image_fmt, **VARIANT_PARAMS.get(image_fmt, {}))
+    if optimize <= OPTIMIZE_NONE:
+        return Encoded(data, len(data))
+    if image_fmt == "png":
+        candidates = png_candidates(image, optimize)
+    elif image_fmt == "webp":
+        candidates = webp_candidates(image)
+    else:
+        return Encoded(data, len(data))
+    return Encoded(min([data, *candidates], key=len), len(data))
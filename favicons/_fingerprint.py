@@ -0,0 +1,76 @@
+"""Embed content hashes in favicon file names, so they can be cached indefinitely."""
+
+# Standard Library
+import re
+import json as _json
+from typing import Any, Dict, List, Optional
+from pathlib import Path
+
+MAPPING_NAME = "favicons.map.json"
+MAPPING_VERSION = 1
+FINGERPRINT_LENGTH = 8
+
+
+def fingerprint_name(filename: str, digest: str) -> str:
+    """Insert the start of a content digest before a file name's extension."""
+    stem, dot, ext = filename.rpartition(".")
+    if not dot:
+        return f"{filename}.{digest[:FINGERPRINT_LENGTH]}"
+    return f"{stem}.{digest[:FINGERPRINT_LENGTH]}.{ext}"
+
+
+def dump_mapping(source_hash: str, options: Dict[str, Any], files: Dict[str, str]) -> bytes:
+    """Serialize a mapping of file name to fingerprinted file name."""
+    mapping = {
+        "version": MAPPING_VERSION,
+        "source": source_hash,
+        "options": options,
+        "files": files,
+    }
+    return _json.dumps(mapping, indent=2, sort_keys=True).encode()
+
+
+def read_mapping(
+    directory: Path, source_hash: Optional[str] = None, options: Optional[Dict[str, Any]] = None
+) -> Optional[Dict[str, str]]:
+    """Read the fingerprinted file names in directory, if they match source_hash & options."""
+    try:
+        mapping = _json.loads((directory / MAPPING_NAME).read_text())
+    except (OSError, ValueError):
+        return None
+    if mapping.get("version") != MAPPING_VERSION:
+        return None
+    if source_hash is not None and mapping.get("source") != source_hash:
+        return None
+    if options is not None and mapping.get("options") != options:
+        return None
+    files: Optional[Dict[str, str]] = mapping.get("files")
+    return files
+
+
+def prune_fingerprints(directory: Path) -> List[Path]:
+    """Delete fingerprinted favicons in directory that its mapping no longer refers to.
+
+    Only files named like a fingerprinted version of a file in the mapping are removed.
+    """
+    files = read_mapping(directory)
+    if files is None:
+        return []
+
+    current = set(files.values())
+    patterns = []
+    for filename in files:
+        stem, dot, ext = filename.rpartition(".")
+        hex_digest = f"[0-9a-f]{{{FINGERPRINT_LENGTH}}}"
+        if dot:
+            patterns.append(f"{re.escape(stem)}\\.{hex_digest}\\.{re.escape(ext)}")
+        else:
+            patterns.append(f"{re.escape(filename)}\\.{hex_digest}")
+    stale = re.compile("|".join(patterns))
+
+    removed = []
+    for path in directory.iterdir():
+        if path.name not in current and stale.fullmatch(path.name):
+            path.unlink()
+            removed.append(path)
+    return removed
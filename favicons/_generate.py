@@ -1,33 +1,68 @@
 """Generate common favicon formats from a single source image."""
 
 # Standard Library
+import os
 import json as _json
-import math
-import asyncio
+import threading
+from io import BytesIO
 from types import TracebackType
 from typing import (
+    TYPE_CHECKING,
     Any,
+    Dict,
     Type,
     Tuple,
     Union,
+    BinaryIO,
     Callable,
     Optional,
     Coroutine,
     Generator,
     Collection,
+    AsyncGenerator,
 )
 from pathlib import Path
-
-# Third Party
-from PIL import Image as PILImage
+from contextlib import aclosing, nullcontext
 
 # Project
-from favicons._util import svg_to_png, validate_path, generate_icon_types
+from favicons._svg import SvgSource, default_backend
+from favicons._util import is_svg, hash_file, hash_bytes, hash_stream, validate_path
+from favicons._sinks import Sink, DirectorySink
 from favicons._types import Color, FaviconProperties
-from favicons._constants import HTML_LINK, SUPPORTED_FORMATS
-from favicons._exceptions import FaviconNotSupportedError
+from favicons._decode import decode_bounded
+from favicons._encode import OPTIMIZE_NONE
+from favicons._render import Rendered, RenderJob, render_icon
+from favicons._resize import DEFAULT_QUALITY, Size, ResizePyramid, get_quality
+from favicons._metrics import Metrics
+from favicons._constants import SUPPORTED_FORMATS
+from favicons._icon_sets import IconSet, RenderPlan, get_icon_set
+from favicons._exceptions import FaviconsError, FaviconNotSupportedError
+from favicons._fingerprint import (
+    MAPPING_NAME,
+    dump_mapping,
+    read_mapping,
+    fingerprint_name,
+)
+from favicons._incremental import OutputManifest
+from favicons._source_cache import (
+    SourceKey,
+    SourceCache,
+    CachedSource,
+    DecodedSource,
+    get_source_cache,
+)
+
+if TYPE_CHECKING:
+    # Standard Library
+    import asyncio
+    from contextlib import AbstractContextManager
+    from concurrent.futures import Executor
+
+    # Third Party
+    from PIL import Image as PILImage
 
 LoosePath = Union[Path, str]
+LooseSource = Union[LoosePath, bytes, BinaryIO]
 LooseColor = Union[Collection[int], str]
 
 
@@ -36,39 +71,90 @@ class Favicons:
 
     def __init__(
         self,
-        source: LoosePath,
-        output_directory: LoosePath,
+        source: LooseSource,
+        output_directory: Optional[LoosePath] = None,
         background_color: LooseColor = "#000000",
         transparent: bool = True,
         base_url: str = "/",
+        executor: Optional["Executor"] = None,
+        concurrency: Optional[int] = None,
+        jobs: int = 1,
+        sink: Optional[Sink] = None,
+        incremental: bool = False,
+        svg_backend: Optional[str] = None,
+        icon_set: Union[str, IconSet] = "default",
+        optimize: int = OPTIMIZE_NONE,
+        variants: Collection[str] = (),
+        fingerprint: bool = False,
+        memory_budget: Optional[int] = None,
+        metrics: Optional[Metrics] = None,
+        source_cache: Union[bool, SourceCache] = False,
+        quality: str = DEFAULT_QUALITY,
         *args: Any,
         **kwargs: Any,
     ) -> None:
         """Initialize Favicons class."""
         self._validated = False
         self._output_directory = output_directory
-        self._formats = tuple(generate_icon_types())
+        self.output_directory: Optional[Path] = None
+        self.variants = tuple(variants)
+        self.icon_set = get_icon_set(icon_set).with_variants(self.variants)
+        self._formats = self.icon_set.formats
         self.transparent = transparent
         self.base_url = base_url
+        self.executor = executor
+        self.concurrency = concurrency or os.cpu_count() or 1
+        self.jobs = jobs
+        self.sink = sink
+        self.incremental = incremental
+        self.svg_backend = svg_backend
         self.background_color: Color = Color(background_color)
         self.generate: Union[Callable, Coroutine] = self.sgenerate
+        self.optimize = optimize
+        self.fingerprint = fingerprint
+        self.memory_budget = memory_budget
+        self.metrics = metrics
+        self.quality = quality
+        self._quality = get_quality(quality)
+        self.source_cache: Optional[SourceCache] = None
+        if isinstance(source_cache, SourceCache):
+            self.source_cache = source_cache
+        elif source_cache:
+            self.source_cache = get_source_cache()
+        self._source_key: Optional[SourceKey] = None
+        self._output_names: Dict[str, str] = {}
         self.completed: int = 0
-        self._temp_source: Optional[Path] = None
+        self.bytes_saved: int = 0
+        self.skipped: int = 0
+        self._completed_lock = threading.Lock()
+        self._master: Optional["PILImage.Image"] = None
+        self._source_size: Optional[Size] = None
+        self._pyramid: Optional[ResizePyramid] = None
+        self._svg: Optional[SvgSource] = None
 
         if isinstance(source, str):
             source = Path(source)
+        elif isinstance(source, (bytes, bytearray, memoryview)):
+            source = BytesIO(source)
+        elif not isinstance(source, Path) and not source.seekable():
+            # The source is read more than once, e.g. to sniff its format & to hash it.
+            source = BytesIO(source.read())
 
         self._source = source
-
-        self._check_source_format()
+        self._original_source = source
 
     def _validate(self) -> None:
+        self.source: Union[Path, BinaryIO] = self._source
+
+        if isinstance(self._source, Path):
+            self.source = validate_path(self._source)
 
-        self.source = validate_path(self._source)
-        self.output_directory = validate_path(self._output_directory, create=True)
+            if self.source.suffix.lower() not in SUPPORTED_FORMATS:
+                raise FaviconNotSupportedError(self.source)
 
-        if self.source.suffix.lower() not in SUPPORTED_FORMATS:
-            raise FaviconNotSupportedError(self.source)
+        if self._output_directory is not None:
+            # Created by the directory sink, only once favicons are written to it.
+            self.output_directory = Path(self._output_directory)
 
         self._validated = True
 
@@ -85,8 +171,7 @@ class Favicons:
         traceback: Optional[TracebackType] = None,
     ) -> None:
         """Exit Favicons context."""
-        self._close_temp_source()
-        pass
+        self.close()
 
     async def __aenter__(self) -> "Favicons":
         """Enter Favicons context."""
@@ -101,92 +186,537 @@ class Favicons:
         traceback: Optional[TracebackType] = None,
     ) -> None:
         """Exit Favicons context."""
-        self._close_temp_source()
-        pass
-
-    def _close_temp_source(self) -> None:
-        """Close temporary file if it exists."""
-        if self._temp_source is not None:
-            try:
-                self._temp_source.unlink()
-            except FileNotFoundError:
-                pass
-
-    def _check_source_format(self) -> None:
-        """Convert source image to PNG if it's in SVG format."""
-        if self._source.suffix == ".svg":
-            self._source = svg_to_png(self._source, self.background_color)
-
-    @staticmethod
-    def _get_center_point(background: PILImage, foreground: PILImage) -> Tuple:
-        """Generate a tuple of center points for PIL."""
-        bg_x, bg_y = background.size[0:2]
-        fg_x, fg_y = foreground.size[0:2]
-        x1 = math.floor((bg_x / 2) - (fg_x / 2))
-        y1 = math.floor((bg_y / 2) - (fg_y / 2))
-        x2 = math.floor((bg_x / 2) + (fg_x / 2))
-        y2 = math.floor((bg_y / 2) + (fg_y / 2))
-        return (x1, y1, x2, y2)
-
-    def _generate_single(self, format_properties: FaviconProperties) -> None:
-        with PILImage.open(self.source) as src:
-            output_file = self.output_directory / str(format_properties)
-            bg: Tuple[int, ...] = self.background_color.colors
-
-            # If transparency is enabled, add alpha channel to color.
-            if self.transparent:
-                bg += (0,)
-
-            # Create background.
-            dst = PILImage.new("RGBA", format_properties.dimensions, bg)
-
-            # Resize source image without changing aspect ratio.
-            src.thumbnail(format_properties.dimensions)
-
-            # Place source image on top of background image.
-            dst.paste(src, box=self._get_center_point(dst, src))
-
-            # Save new file.
-            dst.save(output_file, format_properties.image_fmt)
+        self.close()
+
+    def close(self) -> None:
+        """Free decoded or parsed source data. Called automatically when leaving the context."""
+        self._release_master()
+
+    def _cached(self, *options: Any) -> Tuple[Optional[SourceKey], Optional[CachedSource]]:
+        """Key the source & the options it's decoded with, & look it up, if sharing sources."""
+        if self.source_cache is None:
+            return None, None
+        key = (self.source_cache.digest(self.source), *options)
+        return key, self.source_cache.get(key)
+
+    def _share(self, key: Optional[SourceKey], source: CachedSource) -> None:
+        """Cache a decoded source, or update its cached size, if sharing sources."""
+        if key is not None and self.source_cache is not None:
+            self.source_cache.put(key, source)
+            self._source_key = key
+
+    def _load_master(self) -> "PILImage.Image":
+        """Decode the source image once and keep it as an RGBA master for this run."""
+        # Third Party
+        from PIL import Image as PILImage
+
+        if self._master is not None:
+            return self._master
+
+        # A budget decodes to a size that depends on the targets & reducing gap.
+        targets = tuple(sorted({f.dimensions for f in self._formats}))
+        budgeted = (targets, self._quality.reducing_gap) if self.memory_budget else ()
+        key, cached = self._cached("raster", self.memory_budget, *budgeted)
+        if isinstance(cached, DecodedSource):
+            self._master, self._source_size = cached
+            self._source_key = key
+            return cached.master
+
+        with self._timed("decode"), PILImage.open(self.source) as src:
+            self._source_size = src.size
+            if self.memory_budget is not None:
+                self._master = decode_bounded(
+                    src, targets, self.memory_budget, self._quality.reducing_gap
+                )
+            else:
+                src.load()
+                self._master = src.convert("RGBA")
+
+        self._share(key, DecodedSource(self._master, self._source_size))
+        return self._master
+
+    def _load_svg(self) -> SvgSource:
+        """Parse the SVG source, or get it (& whatever it has rasterized) from the cache."""
+        key, cached = self._cached("svg", self.svg_backend)
+        if isinstance(cached, SvgSource):
+            self._source_key = key
+            return cached
+
+        with self._timed("decode"):
+            svg = SvgSource(self.source, backend=self.svg_backend)
+        self._share(key, svg)
+        return svg
+
+    def _load_pyramid(self) -> Union[ResizePyramid, SvgSource]:
+        """Plan every output size against the master image, or parse the SVG source.
+
+        Nothing is decoded or parsed until pixels are actually needed, so getting names, HTML
+        or JSON never reads the source.
+        """
+        if self._svg is None and self._is_svg():
+            self._svg = self._load_svg()
+        if self._svg is not None:
+            return self._svg
+        if self._pyramid is None:
+            # Third Party
+            from PIL import Image as PILImage
+
+            master = self._load_master()
+            with self._timed("resize"):
+                self._pyramid = ResizePyramid(
+                    master,
+                    (f.dimensions for f in self._formats),
+                    resample=PILImage.Resampling[self._quality.resample],
+                    reducing_gap=self._quality.reducing_gap,
+                    source_size=self._source_size,
+                    background=None if self.transparent else self.background_color.colors,
+                )
+        return self._pyramid
+
+    def _release_master(self) -> None:
+        """Free the decoded master image & its intermediates, or the parsed SVG & its rasters.
+
+        Sources shared through the source cache are left to it, instead.
+        """
+        shared = self._source_key is not None
+        if self._svg is not None:
+            if shared:
+                # Account for anything rasterized since the SVG was cached.
+                self._share(self._source_key, self._svg)
+            else:
+                self._svg.close()
+            self._svg = None
+        if self._pyramid is not None:
+            self._pyramid.close()
+            self._pyramid = None
+        if self._master is not None:
+            if not shared:
+                self._master.close()
+            self._master = None
+        self._source_key = None
+
+    def _is_svg(self) -> bool:
+        """Determine if the source is in SVG format."""
+        if isinstance(self.source, Path):
+            return self.source.suffix.lower() == ".svg"
+        return is_svg(self.source)
+
+    def _check_variants(self) -> None:
+        """Ensure this build of Pillow can encode every variant format."""
+        # Third Party
+        from PIL import features
+
+        unsupported = [v for v in self.variants if not features.check(v)]
+        if unsupported:
+            raise FaviconsError(
+                "This installation of Pillow can't encode {unsupported}.",
+                unsupported=", ".join(unsupported),
+            )
 
-            self.completed += 1
+    def _job(self, dimensions: Size, image_fmts: Tuple[str, ...]) -> RenderJob:
+        """Prepare a self-contained render job for a canvas size & the formats to encode it in."""
+        pyramid = self._load_pyramid()
+        # SVG sources are rasterized here, & pyramid levels are flattened when first used, so jobs
+        # are prepared on the executor that renders them.
+        timed: "AbstractContextManager[None]" = nullcontext()
+        if self._svg is not None:
+            timed = self._timed("rasterize")
+        elif not self.transparent:
+            timed = self._timed("composite")
+        with timed:
+            source, box, size = pyramid.source_for(dimensions)
+        bg: Tuple[int, ...] = self.background_color.colors
+
+        # If transparency is enabled, add alpha channel to color.
+        if self.transparent:
+            bg += (0,)
+
+        return RenderJob(
+            source=source,
+            size=size,
+            box=box,
+            resample=pyramid.resample,
+            dimensions=dimensions,
+            background=bg,
+            image_fmts=image_fmts,
+            optimize=self.optimize,
+            # SVG rasters are shared by every background, so they're blended as they're placed.
+            composite=not self.transparent and self._svg is not None,
+        )
+
+    def _prepare(self) -> None:
+        """Check variants can be encoded, & decode or parse the source."""
+        self._check_variants()
+        self._load_pyramid()
+
+    def _render_job(self, dimensions: Size, image_fmts: Tuple[str, ...]) -> Rendered:
+        """Prepare & render a job, so both run on the same executor thread."""
+        return render_icon(self._job(dimensions, image_fmts))
+
+    def _get_sink(self) -> Sink:
+        """Get the configured sink, or a directory sink for the output directory."""
+        if not self._validated:
+            self._validate()
+        if self.sink is not None:
+            return self.sink
+        if self.output_directory is None:
+            raise FaviconsError(
+                "An output directory or sink is required to save favicons outside of memory."
+            )
+        return DirectorySink(self.output_directory)
+
+    def _render_options(self) -> Dict[str, Any]:
+        """Get every option, besides the source & format, that affects rendered output."""
+        return {
+            "background_color": self.background_color.as_hex(),
+            "transparent": self.transparent,
+            "optimize": self.optimize,
+            "fingerprint": self.fingerprint,
+            "memory_budget": self.memory_budget,
+            "quality": self.quality,
+            # Only SVG output depends on the backend, & resolving the default imports it.
+            "svg_backend": (self.svg_backend or default_backend()) if self._is_svg() else None,
+        }
+
+    def _source_hash(self) -> str:
+        """Hash the source's contents."""
+        if isinstance(self._original_source, Path):
+            return hash_file(self._original_source)
+        return hash_stream(self._original_source)
+
+    def _output_name(self, format_properties: FaviconProperties, data: bytes) -> str:
+        """Get the file name to write a favicon to, fingerprinted with its contents if enabled."""
+        name = format_properties.filename
+        if self.fingerprint:
+            name = fingerprint_name(name, hash_bytes(data))
+        self._output_names[format_properties.filename] = name
+        return name
+
+    def _mapping(self) -> bytes:
+        """Serialize the file names favicons were written to."""
+        return dump_mapping(self._source_hash(), self._render_options(), self._output_names)
+
+    def _filenames(self) -> Dict[str, str]:
+        """Get the file name each format is (or would be) written to.
+
+        When fingerprinting, names come from this instance's last run, or the output directory's
+        mapping file, whatever options it was generated with, so names always match the files
+        on disk. If there's no mapping file, they come from an in-memory render.
+        """
+        if not self.fingerprint:
+            return {f.filename: f.filename for f in self._formats}
+        if not self._validated:
+            self._validate()
 
-    async def _agenerate_single(self, format_properties: FaviconProperties) -> None:
-        """Awaitable version of _generate_single."""
+        if any(f.filename not in self._output_names for f in self._formats):
+            if self.output_directory is not None and read_mapping(self.output_directory):
+                mapping = read_mapping(self.output_directory, self._source_hash())
+                if mapping is None or any(f.filename not in mapping for f in self._formats):
+                    raise FaviconsError(
+                        "The favicons in {directory} were generated from a different source or "
+                        "set of formats. Generate them again to get their fingerprinted names.",
+                        directory=str(self.output_directory),
+                    )
+                self._output_names.update(mapping)
+            else:
+                for fmt, data in self._render_gen():
+                    self._output_name(fmt, data)
+        return self._output_names
+
+    def _load_manifest(self) -> Optional[OutputManifest]:
+        """Load the output directory's manifest if generating incrementally."""
+        if not self.incremental or self.sink is not None or self.output_directory is None:
+            return None
+        return OutputManifest(self.output_directory, self._source_hash(), self._render_options())
+
+    def _plan(
+        self, manifest: Optional[OutputManifest]
+    ) -> Tuple[Tuple[FaviconProperties, ...], Tuple[FaviconProperties, ...]]:
+        """Split formats into those that are current & those that need rendering."""
+        if manifest is None:
+            return (), self._formats
+        current = tuple(f for f in self._formats if manifest.is_current(f))
+        return current, tuple(f for f in self._formats if f not in current)
+
+    def _mark_completed(self) -> None:
+        """Count a completed favicon."""
+        with self._completed_lock:
+            self.completed += 1
 
-        return self._generate_single(format_properties)
+    def _timed(self, stage: str) -> "AbstractContextManager[None]":
+        """Time a block as a run of stage, if recording metrics."""
+        if self.metrics is None:
+            return nullcontext()
+        return self.metrics.time(stage)
+
+    def _encoded(self, rendered: Rendered) -> Dict[str, bytes]:
+        """Count the bytes an optimized render saved & get its data in each format."""
+        with self._completed_lock:
+            self.bytes_saved += sum(e.saved for e in rendered.encoded.values())
+        if self.metrics is not None:
+            self.metrics.record_all(rendered.timings)
+        return {image_fmt: e.data for image_fmt, e in rendered.encoded.items()}
+
+    def _done(
+        self, plan: RenderPlan, size: Size, encoded: Dict[str, bytes]
+    ) -> Generator[Tuple[FaviconProperties, bytes], None, None]:
+        """Yield every format a render completes, recording its size if recording metrics."""
+        for fmt, data in plan.done(size, encoded):
+            if self.metrics is not None:
+                self.metrics.record_output(fmt.image_fmt, len(data))
+            yield fmt, data
+
+    def _write(self, sink: Sink, name: str, data: bytes) -> None:
+        """Write a favicon to a sink."""
+        with self._timed("write"):
+            sink.write(name, data)
+
+    def _render_gen(
+        self, formats: Optional[Tuple[FaviconProperties, ...]] = None
+    ) -> Generator[Tuple[FaviconProperties, bytes], None, None]:
+        """Render every format, yielding each as it completes.
+
+        Formats with identical images are rendered once & yielded together. ICO formats are
+        assembled from PNG renders, so they're yielded once each of their sizes is rendered.
+        """
+        plan = self.icon_set.plan(self._formats if formats is None else formats)
+        if not plan.images:
+            return
+        if not self._validated:
+            self._validate()
 
-    def sgenerate(self) -> None:
-        """Generate favicons."""
+        self._prepare()
+
+        if self.executor is None and self.jobs <= 1:
+            for size, image_fmts in plan.images.items():
+                rendered = render_icon(self._job(size, image_fmts))
+                yield from self._done(plan, size, self._encoded(rendered))
+            return
+
+        # Standard Library
+        from concurrent.futures import (
+            ThreadPoolExecutor,
+            ProcessPoolExecutor,
+            as_completed,
+        )
+
+        executor = self.executor or ThreadPoolExecutor(max_workers=self.jobs)
+        if isinstance(executor, ProcessPoolExecutor):
+            # Jobs are self-contained, but are prepared from this instance, in this process.
+            futures = {
+                executor.submit(render_icon, self._job(size, image_fmts)): size
+                for size, image_fmts in plan.images.items()
+            }
+        else:
+            futures = {
+                executor.submit(self._render_job, size, image_fmts): size
+                for size, image_fmts in plan.images.items()
+            }
+        try:
+            for future in as_completed(futures):
+                yield from self._done(plan, futures[future], self._encoded(future.result()))
+        finally:
+            for future in futures:
+                future.cancel()
+            if self.executor is None:
+                executor.shutdown()
+
+    async def _arender_single(
+        self,
+        size: Size,
+        image_fmts: Tuple[str, ...],
+        semaphore: "asyncio.Semaphore",
+    ) -> Tuple[Size, Dict[str, bytes]]:
+        """Awaitable version of render_icon, run on the executor."""
+        # Standard Library
+        import asyncio
+        from concurrent.futures import ProcessPoolExecutor
+
+        loop = asyncio.get_running_loop()
+        async with semaphore:
+            if isinstance(self.executor, ProcessPoolExecutor):
+                # Jobs are self-contained, but are prepared from this instance, in this process.
+                job = await loop.run_in_executor(None, self._job, size, image_fmts)
+                rendered = await loop.run_in_executor(self.executor, render_icon, job)
+            else:
+                rendered = await loop.run_in_executor(
+                    self.executor, self._render_job, size, image_fmts
+                )
+        return size, self._encoded(rendered)
+
+    async def _arender_gen(
+        self, formats: Optional[Tuple[FaviconProperties, ...]] = None
+    ) -> AsyncGenerator[Tuple[FaviconProperties, bytes], None]:
+        """Render every format concurrently, yielding each as it completes.
+
+        Formats with identical images are rendered once & yielded together. ICO formats are
+        assembled from PNG renders, so they're yielded once each of their sizes is rendered.
+        """
+        plan = self.icon_set.plan(self._formats if formats is None else formats)
+        if not plan.images:
+            return
         if not self._validated:
             self._validate()
 
-        for fmt in self._formats:
-            self._generate_single(fmt)
+        # Standard Library
+        import asyncio
+
+        await asyncio.get_running_loop().run_in_executor(None, self._prepare)
+        semaphore = asyncio.Semaphore(self.concurrency)
+        tasks = [
+            asyncio.ensure_future(self._arender_single(size, image_fmts, semaphore))
+            for size, image_fmts in plan.images.items()
+        ]
+        try:
+            for task in asyncio.as_completed(tasks):
+                size, encoded = await task
+                for fmt, data in self._done(plan, size, encoded):
+                    yield fmt, data
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def sgenerate_iter(self) -> Generator[FaviconProperties, None, None]:
+        """Generate favicons, yielding each format as it completes.
+
+        With `jobs` greater than 1, formats are rendered on a thread pool of that size (or on
+        `executor`, if one was given) & may complete out of order. Worker threads share the
+        decoded source rather than each reading it again.
+
+        Favicons are written to `sink`, or to `output_directory` if no sink was given. The sink
+        is only committed once every format has been written, so if generation fails or
+        iteration stops early, nothing in the output directory is replaced.
+
+        With `incremental`, formats whose source & options are unchanged since the last run
+        (according to the output directory's manifest) & whose files still exist are skipped.
+        They're still yielded, first, but counted in `skipped` rather than `completed`.
+        """
+        sink = self._get_sink()
+        manifest = self._load_manifest()
+        current, pending = self._plan(manifest)
+
+        with sink:
+            for fmt in current:
+                if manifest is not None:
+                    self._output_names[fmt.filename] = manifest.output_file(fmt)
+                self.skipped += 1
+                yield fmt
+            for fmt, data in self._render_gen(pending):
+                name = self._output_name(fmt, data)
+                self._write(sink, name, data)
+                if manifest is not None:
+                    manifest.record(fmt, data, name)
+                self._mark_completed()
+                yield fmt
+            if self.fingerprint:
+                sink.write(MAPPING_NAME, self._mapping())
+
+        if manifest is not None:
+            manifest.save()
 
-    async def agenerate(self) -> None:
+    def sgenerate(self) -> None:
         """Generate favicons."""
-        if not self._validated:
-            self._validate()
+        for _ in self.sgenerate_iter():
+            pass
+
+    async def agenerate_iter(self) -> AsyncGenerator[FaviconProperties, None]:
+        """Generate favicons concurrently, yielding each format as it completes.
+
+        At most `concurrency` formats are rendered at once. If the caller stops iterating or is
+        cancelled, formats that haven't started yet are cancelled. Output & `incremental`
+        behave as in `sgenerate_iter`.
+        """
+        # Standard Library
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        sink = self._get_sink()
+        manifest = await loop.run_in_executor(None, self._load_manifest)
+        current, pending = await loop.run_in_executor(None, self._plan, manifest)
+
+        await loop.run_in_executor(None, sink.open)
+        try:
+            for fmt in current:
+                if manifest is not None:
+                    self._output_names[fmt.filename] = manifest.output_file(fmt)
+                self.skipped += 1
+                yield fmt
+            async with aclosing(self._arender_gen(pending)) as results:
+                async for fmt, data in results:
+                    name = self._output_name(fmt, data)
+                    await loop.run_in_executor(None, self._write, sink, name, data)
+                    if manifest is not None:
+                        manifest.record(fmt, data, name)
+                    self._mark_completed()
+                    yield fmt
+            if self.fingerprint:
+                mapping = await loop.run_in_executor(None, self._mapping)
+                await loop.run_in_executor(None, sink.write, MAPPING_NAME, mapping)
+        except BaseException:
+            await loop.run_in_executor(None, sink.abort)
+            raise
+        await loop.run_in_executor(None, sink.commit)
+
+        if manifest is not None:
+            await loop.run_in_executor(None, manifest.save)
 
-        await asyncio.gather(*(self._agenerate_single(fmt) for fmt in self._formats))
+    async def agenerate(self) -> None:
+        """Generate favicons."""
+        async for _ in self.agenerate_iter():
+            pass
+
+    def render_gen(self) -> Generator[Tuple[FaviconProperties, memoryview], None, None]:
+        """Render favicons in memory, yielding each format & its encoded image as it completes.
+
+        Nothing is written to disk, so no output directory is needed.
+        """
+        for fmt, data in self._render_gen():
+            self._output_name(fmt, data)
+            self._mark_completed()
+            yield fmt, memoryview(data)
+
+    def render(self) -> Dict[str, bytes]:
+        """Render favicons in memory, as a mapping of (fingerprinted) file name to encoded image."""
+        rendered = {}
+        for fmt, data in self._render_gen():
+            self._mark_completed()
+            rendered[self._output_name(fmt, data)] = data
+        return rendered
+
+    async def arender_gen(self) -> AsyncGenerator[Tuple[FaviconProperties, memoryview], None]:
+        """Awaitable version of render_gen."""
+        async with aclosing(self._arender_gen()) as results:
+            async for fmt, data in results:
+                self._output_name(fmt, data)
+                self._mark_completed()
+                yield fmt, memoryview(data)
+
+    async def arender(self) -> Dict[str, bytes]:
+        """Awaitable version of render."""
+        rendered = {}
+        async with aclosing(self._arender_gen()) as results:
+            async for fmt, data in results:
+                self._mark_completed()
+                rendered[self._output_name(fmt, data)] = data
+        return rendered
 
     def html_gen(self) -> Generator:
         """Get generator of HTML strings."""
+        names = self._filenames()
         for fmt in self._formats:
-            yield HTML_LINK.format(
-                rel=fmt.rel,
-                type=f"image/{fmt.image_fmt}",
-                href=self.base_url + str(fmt),
-            )
+            yield fmt.html(self.base_url, names[fmt.filename])
 
     def html(self) -> Tuple:
         """Get tuple of HTML strings."""
         return tuple(self.html_gen())
 
     def formats(self) -> Tuple:
-        """Get image formats as list."""
-        return tuple(f.dict() for f in self._formats)
+        """Get image formats as list, with fingerprinted file names if enabled."""
+        if not self.fingerprint:
+            return tuple(f.dict() for f in self._formats)
+        names = self._filenames()
+        return tuple({**f.dict(), "filename": names[f.filename]} for f in self._formats)
 
     def json(self, *args: Any, **kwargs: Any) -> str:
         """Get image formats as JSON string."""
@@ -194,8 +724,9 @@ class Favicons:
 
     def filenames_gen(self, prefix: bool = False) -> Generator:
         """Get generator of favicon file names."""
+        names = self._filenames()
         for fmt in self._formats:
-            filename = str(fmt)
+            filename = names[fmt.filename]
             if prefix:
                 filename = self.base_url + filename
             yield filename
@@ -0,0 +1,199 @@
+"""Compiled, reusable sets of favicon formats."""
+
+# Standard Library
+from typing import Dict, List, Tuple, Union, Mapping, Iterable, Generator
+from functools import lru_cache
+
+# Project
+from favicons._types import FaviconProperties
+from favicons._render import build_ico, ico_sizes
+from favicons._resize import Size
+from favicons._constants import ICON_TYPES, VARIANT_RELS, VARIANT_FORMATS
+from favicons._exceptions import FaviconsError
+
+IconType = Union[FaviconProperties, Mapping]
+RenderKey = Tuple[Size, str]
+
+
+class IconSet:
+    """An immutable set of favicon formats, compiled once & shared by every Favicons instance.
+
+    Formats that produce identical images, such as `favicon-180x180.png` and
+    `apple-touch-icon-180x180.png`, are grouped so each distinct image is rendered once & then
+    written to every file name that needs it.
+    """
+
+    __slots__ = ("name", "formats", "groups")
+
+    name: str
+    formats: Tuple[FaviconProperties, ...]
+    groups: Tuple[Tuple[FaviconProperties, ...], ...]
+
+    def __init__(self, name: str, icon_types: Iterable[IconType]) -> None:
+        """Compile icon types into formats & render groups."""
+        formats = tuple(
+            t if isinstance(t, FaviconProperties) else FaviconProperties(**t) for t in icon_types
+        )
+        filenames = [f.filename for f in formats]
+        duplicates = sorted({f for f in filenames if filenames.count(f) > 1})
+        if duplicates:
+            raise FaviconsError(
+                "Icon set '{name}' has duplicate file names: {duplicates}",
+                name=name,
+                duplicates=", ".join(duplicates),
+            )
+
+        grouped: Dict[Tuple, List[FaviconProperties]] = {}
+        for fmt in formats:
+            grouped.setdefault(fmt.render_key, []).append(fmt)
+
+        super().__setattr__("name", name)
+        super().__setattr__("formats", formats)
+        super().__setattr__("groups", tuple(tuple(g) for g in grouped.values()))
+
+    def __setattr__(self, name: str, value: object) -> None:
+        """Prevent changes to a compiled set."""
+        raise AttributeError(f"{self.__class__.__name__} is immutable.")
+
+    def __len__(self) -> int:
+        """Count formats."""
+        return len(self.formats)
+
+    def __repr__(self) -> str:
+        """Representation of instance."""
+        return f"{self.__class__.__name__}(name={self.name!r}, formats={len(self.formats)})"
+
+    def group(
+        self, formats: Iterable[FaviconProperties]
+    ) -> Tuple[Tuple[FaviconProperties, ...], ...]:
+        """Group a subset of this set's formats by identical rendered image."""
+        wanted = set(formats)
+        groups = (tuple(f for f in g if f in wanted) for g in self.groups)
+        return tuple(g for g in groups if g)
+
+    def with_variants(self, variants: Iterable[str]) -> "IconSet":
+        """Get a set that also has a format in each variant image format for every PNG format."""
+        return _with_variants(self, tuple(variants))
+
+    def plan(self, formats: Iterable[FaviconProperties]) -> "RenderPlan":
+        """Plan the distinct images needed to produce a subset of this set's formats."""
+        return RenderPlan(self.group(formats))
+
+
+class RenderPlan:
+    """The distinct images to render for a group of formats, & how to fan them out.
+
+    Each canvas size is rendered once & encoded in every image format needed at that size. ICO
+    formats aren't rendered directly: they're assembled from PNG renders at each of their
+    resolutions, which are shared with any PNG formats of the same size.
+    """
+
+    def __init__(self, groups: Iterable[Tuple[FaviconProperties, ...]]) -> None:
+        """Plan renders for groups of identical formats."""
+        images: Dict[Size, List[str]] = {}
+        self._outputs: Dict[RenderKey, Tuple[FaviconProperties, ...]] = {}
+        self._icos: List[Tuple[Tuple[FaviconProperties, ...], Tuple[RenderKey, ...]]] = []
+        self._rendered: Dict[RenderKey, bytes] = {}
+
+        def need(size: Size, image_fmt: str) -> None:
+            image_fmts = images.setdefault(size, [])
+            if image_fmt not in image_fmts:
+                image_fmts.append(image_fmt)
+
+        for group in groups:
+            first = group[0]
+            if first.image_fmt != "ico":
+                need(first.dimensions, first.image_fmt)
+                self._outputs[first.render_key] = group
+                continue
+
+            parts = tuple((size, "png") for size in ico_sizes(first.dimensions))
+            for size, image_fmt in parts:
+                need(size, image_fmt)
+            self._icos.append((group, parts))
+
+        # Canvas size & the image formats to encode it in.
+        self.images: Dict[Size, Tuple[str, ...]] = {k: tuple(v) for k, v in images.items()}
+        # Only keep encoded images that an ICO is waiting on.
+        self._needed = {key for _, parts in self._icos for key in parts}
+
+    def done(
+        self, size: Size, encoded: Mapping[str, bytes]
+    ) -> Generator[Tuple[FaviconProperties, bytes], None, None]:
+        """Record a rendered canvas's encodings, yielding every format that is now complete."""
+        waiting_on = False
+        for image_fmt, data in encoded.items():
+            key = (size, image_fmt)
+            for fmt in self._outputs.get(key, ()):
+                yield fmt, data
+            if key in self._needed:
+                self._rendered[key] = data
+                waiting_on = True
+        if not waiting_on:
+            return
+
+        waiting = []
+        for group, parts in self._icos:
+            if all(part in self._rendered for part in parts):
+                ico = build_ico((size, self._rendered[(size, fmt)]) for size, fmt in parts)
+                for fmt in group:
+                    yield fmt, ico
+            else:
+                waiting.append((group, parts))
+        self._icos = waiting
+
+
+@lru_cache(maxsize=None)
+def _with_variants(icon_set: IconSet, variants: Tuple[str, ...]) -> IconSet:
+    """Compile an icon set's variant formats, once per set & variants."""
+    unsupported = [v for v in variants if v not in VARIANT_FORMATS]
+    if unsupported:
+        raise FaviconsError(
+            "Unsupported variant format(s) {unsupported}. Must be one of {supported}.",
+            unsupported=", ".join(unsupported),
+            supported=", ".join(VARIANT_FORMATS),
+        )
+    if not variants:
+        return icon_set
+
+    formats: List[FaviconProperties] = []
+    for fmt in icon_set.formats:
+        formats.append(fmt)
+        if fmt.image_fmt == "png" and fmt.rel in VARIANT_RELS:
+            formats.extend(
+                FaviconProperties(variant, fmt.dimensions, fmt.prefix, fmt.rel)
+                for variant in variants
+            )
+    return IconSet("+".join((icon_set.name, *variants)), formats)
+
+
+_ICON_SETS: Dict[str, IconSet] = {}
+
+
+def register_icon_set(name: str, icon_types: Iterable[IconType], replace: bool = False) -> IconSet:
+    """Compile & register a named icon set, so it can be selected with `Favicons(icon_set=...)`.
+
+    Icon types may be `FaviconProperties` or mappings of its arguments, as in `ICON_TYPES`.
+    """
+    if name in _ICON_SETS and not replace:
+        raise FaviconsError("Icon set '{name}' is already registered.", name=name)
+    icon_set = IconSet(name, icon_types)
+    _ICON_SETS[name] = icon_set
+    return icon_set
+
+
+def get_icon_set(icon_set: Union[str, IconSet]) -> IconSet:
+    """Get a registered icon set by name, or pass through a compiled one."""
+    if isinstance(icon_set, IconSet):
+        return icon_set
+    try:
+        return _ICON_SETS[icon_set]
+    except KeyError:
+        raise FaviconsError(
+            "Unknown icon set '{name}'. Registered sets: {names}",
+            name=icon_set,
+            names=", ".join(_ICON_SETS),
+        ) from None
+
+
+DEFAULT_ICON_SET = register_icon_set("default", ICON_TYPES)
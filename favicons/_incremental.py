@@ -0,0 +1,92 @@
+"""Track what produced each favicon in an output directory, to skip unchanged work."""
+
+# Standard Library
+import os
+import json as _json
+from typing import Any, Dict, Optional
+from pathlib import Path
+
+# Project
+from favicons._util import hash_bytes
+from favicons._types import FaviconProperties
+
+MANIFEST_NAME = ".favicons.json"
+MANIFEST_VERSION = 3
+
+
+class OutputManifest:
+    """Sidecar manifest recording the source hash, options & output hash of each favicon.
+
+    A favicon is current if the source & options that would produce it match those recorded
+    for it by the previous run, and the file it was written to still exists.
+    """
+
+    def __init__(self, directory: Path, source_hash: str, options: Dict[str, Any]) -> None:
+        """Load any existing manifest in directory."""
+        self.path = directory / MANIFEST_NAME
+        self.directory = directory
+        self.source_hash = source_hash
+        self.options = options
+        self.files: Dict[str, Dict[str, str]] = {}
+        self._previous: Dict[str, Dict[str, str]] = {}
+
+        try:
+            previous = _json.loads(self.path.read_text())
+            if previous.get("version") == MANIFEST_VERSION:
+                self._previous = previous.get("files", {})
+        except (OSError, ValueError):
+            pass
+
+    def input_key(self, format_properties: FaviconProperties) -> str:
+        """Hash everything that determines a favicon's output."""
+        inputs = {
+            "source": self.source_hash,
+            "options": self.options,
+            "format": format_properties.dict(),
+        }
+        return hash_bytes(_json.dumps(inputs, sort_keys=True).encode())
+
+    def is_current(self, format_properties: FaviconProperties) -> bool:
+        """Determine if a favicon's inputs are unchanged & its output still exists.
+
+        Current favicons are carried forward into this run's manifest.
+        """
+        name = str(format_properties)
+        entry = self._previous.get(name)
+        if entry is None or entry.get("input") != self.input_key(format_properties):
+            return False
+        if not (self.directory / entry.get("file", name)).exists():
+            return False
+        self.files[name] = entry
+        return True
+
+    def output_file(self, format_properties: FaviconProperties) -> str:
+        """Get the file name a favicon was written to."""
+        name = str(format_properties)
+        return self.files.get(name, {}).get("file", name)
+
+    def record(
+        self, format_properties: FaviconProperties, data: bytes, file: Optional[str] = None
+    ) -> None:
+        """Record a newly rendered favicon, written to file if it isn't named as usual."""
+        self.files[str(format_properties)] = {
+            "input": self.input_key(format_properties),
+            "output": hash_bytes(data),
+            "file": file or str(format_properties),
+        }
+
+    def save(self) -> None:
+        """Atomically write the manifest."""
+        # Standard Library
+        from tempfile import mkstemp
+
+        manifest = {
+            "version": MANIFEST_VERSION,
+            "source": self.source_hash,
+            "options": self.options,
+            "files": self.files,
+        }
+        fd, temp_name = mkstemp(prefix=f"{MANIFEST_NAME}.", suffix=".tmp", dir=self.directory)
+        with os.fdopen(fd, "w") as f:
+            _json.dump(manifest, f, indent=2, sort_keys=True)
+        os.replace(temp_name, self.path)
@@ -0,0 +1,87 @@
+"""Record where favicon generation spends its time, & how many bytes each format produces."""
+
+# Standard Library
+import json as _json
+import time
+import threading
+from typing import Any, Dict, Tuple, Iterable, Iterator, NamedTuple
+from contextlib import contextmanager
+
+# Pipeline stages, in order.
+STAGES = ("decode", "rasterize", "resize", "composite", "encode", "write")
+
+# A stage & its duration in seconds.
+Timing = Tuple[str, float]
+
+
+class StageStats(NamedTuple):
+    """Accumulated durations of one pipeline stage."""
+
+    calls: int = 0
+    total: float = 0.0
+    max: float = 0.0
+
+    @property
+    def mean(self) -> float:
+        """Mean duration in seconds."""
+        return self.total / self.calls if self.calls else 0.0
+
+
+class Metrics:
+    """Per-stage timings & bytes per image format, accumulated across runs.
+
+    Pass an instance to `Favicons(metrics=...)`. Stages are recorded from whichever thread
+    completes them, so recording is thread-safe. Override `record` to forward each timing
+    elsewhere as it happens.
+    """
+
+    def __init__(self) -> None:
+        """Start with no recorded timings."""
+        self.stages: Dict[str, StageStats] = {}
+        self.bytes: Dict[str, int] = {}
+        self.files: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def record(self, stage: str, seconds: float) -> None:
+        """Record one run of a stage."""
+        with self._lock:
+            stats = self.stages.get(stage, StageStats())
+            self.stages[stage] = StageStats(
+                stats.calls + 1, stats.total + seconds, max(stats.max, seconds)
+            )
+
+    def record_all(self, timings: Iterable[Timing]) -> None:
+        """Record timings measured elsewhere, such as in a worker process."""
+        for stage, seconds in timings:
+            self.record(stage, seconds)
+
+    def record_output(self, image_fmt: str, size: int) -> None:
+        """Record a favicon's encoded size."""
+        with self._lock:
+            self.bytes[image_fmt] = self.bytes.get(image_fmt, 0) + size
+            self.files[image_fmt] = self.files.get(image_fmt, 0) + 1
+
+    @contextmanager
+    def time(self, stage: str) -> Iterator[None]:
+        """Record the duration of a block as a run of stage."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - start)
+
+    def dict(self) -> Dict[str, Any]:
+        """Represent metrics as a dict, with durations in seconds."""
+        ordered = sorted(self.stages, key=lambda s: STAGES.index(s) if s in STAGES else len(STAGES))
+        return {
+            "stages": {
+                stage: {**self.stages[stage]._asdict(), "mean": self.stages[stage].mean}
+                for stage in ordered
+            },
+            "bytes": dict(self.bytes),
+            "files": dict(self.files),
+        }
+
+    def json(self, *args: Any, **kwargs: Any) -> str:
+        """Represent metrics as a JSON string."""
+        return _json.dumps(self.dict(), *args, **kwargs)
@@ -0,0 +1,113 @@
+"""Render a single favicon from a prepared source image."""
+
+# Standard Library
+import math
+import time
+import struct
+from typing import TYPE_CHECKING, Dict, Tuple, Iterable, Optional, Sequence, NamedTuple
+
+# Project
+from favicons._encode import OPTIMIZE_NONE, Encoded, encode
+from favicons._resize import Box, Size
+from favicons._metrics import Timing
+from favicons._constants import ICO_SIZES
+
+if TYPE_CHECKING:
+    # Third Party
+    from PIL import Image as PILImage
+
+
+class RenderJob(NamedTuple):
+    """Everything needed to render one favicon, without reference to a Favicons instance.
+
+    Jobs only hold plain values & an image, so they can be sent to a process pool as well as
+    run on a thread.
+    """
+
+    source: "PILImage.Image"
+    size: Tuple[int, int]
+    box: Optional[Box]
+    resample: "PILImage.Resampling"
+    dimensions: Tuple[int, int]
+    background: Tuple[int, ...]
+    image_fmts: Tuple[str, ...]
+    optimize: int = OPTIMIZE_NONE
+    # Blend the source over an opaque background, if it wasn't flattened up front.
+    composite: bool = False
+
+
+class Rendered(NamedTuple):
+    """A render's encoding in each image format, & how long each stage of it took."""
+
+    encoded: Dict[str, Encoded]
+    timings: Tuple[Timing, ...]
+
+
+def center_point(
+    background: Tuple[int, int], foreground: Tuple[int, int]
+) -> Tuple[int, int, int, int]:
+    """Generate a tuple of center points for PIL."""
+    bg_x, bg_y = background
+    fg_x, fg_y = foreground
+    x1 = math.floor((bg_x / 2) - (fg_x / 2))
+    y1 = math.floor((bg_y / 2) - (fg_y / 2))
+    x2 = math.floor((bg_x / 2) + (fg_x / 2))
+    y2 = math.floor((bg_y / 2) + (fg_y / 2))
+    return (x1, y1, x2, y2)
+
+
+def render_icon(job: RenderJob) -> Rendered:
+    """Resize & place a favicon, then encode the same image in each of the job's formats."""
+    # Third Party
+    from PIL import Image as PILImage
+
+    start = time.perf_counter()
+
+    # Resize source image without changing aspect ratio.
+    src = job.source.resize(job.size, job.resample, box=job.box)
+    resized = time.perf_counter()
+
+    if src.size == job.dimensions and not job.composite:
+        # Nothing to place the source on: it's already transparent or flattened.
+        dst = src
+    else:
+        dst = PILImage.new("RGBA", job.dimensions, job.background)
+        offset = center_point(dst.size, src.size)[:2]
+        if job.composite:
+            dst.alpha_composite(src, dest=offset)
+        else:
+            # A transparent background is entirely replaced, & a flattened source is opaque.
+            dst.paste(src, box=offset)
+    composited = time.perf_counter()
+
+    encoded = {image_fmt: encode(dst, image_fmt, job.optimize) for image_fmt in job.image_fmts}
+    timings = (
+        ("resize", resized - start),
+        ("composite", composited - resized),
+        ("encode", time.perf_counter() - composited),
+    )
+    return Rendered(encoded, timings)
+
+
+def ico_sizes(dimensions: Size) -> Tuple[Size, ...]:
+    """Get the resolutions to embed in an ICO of the given dimensions, smallest first."""
+    sizes = {s for s in ICO_SIZES if s[0] <= dimensions[0] and s[1] <= dimensions[1]}
+    if dimensions[0] <= 256 and dimensions[1] <= 256:
+        sizes.add(dimensions)
+    return tuple(sorted(sizes))
+
+
+def build_ico(images: Iterable[Tuple[Size, bytes]]) -> bytes:
+    """Assemble an ICO file from already encoded PNG images, without decoding or resampling."""
+    entries: Sequence[Tuple[Size, bytes]] = tuple(images)
+    header = struct.pack("<HHH", 0, 1, len(entries))
+    offset = len(header) + 16 * len(entries)
+    directory, data = [], []
+    for (width, height), png in entries:
+        # Dimensions of 256 are stored as 0.
+        directory.append(
+            struct.pack("<BBBBHHII", width % 256, height % 256, 0, 0, 1, 32, len(png), offset)
+        )
+        data.append(png)
+        offset += len(png)
+    return b"".join((header, *directory, *data))
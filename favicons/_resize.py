@@ -0,0 +1,191 @@
+"""Plan & perform cascading downscales from a single master image."""
+
+# Standard Library
+import math
+import threading
+from typing import (
+    TYPE_CHECKING,
+    Dict,
+    List,
+    Tuple,
+    Callable,
+    Iterable,
+    Optional,
+    NamedTuple,
+)
+
+# Project
+from favicons._exceptions import FaviconsError
+
+if TYPE_CHECKING:
+    # Third Party
+    from PIL import Image as PILImage
+
+Size = Tuple[int, int]
+Box = Tuple[float, float, float, float]
+
+
+class Quality(NamedTuple):
+    """A resampling filter & how much larger than its output an intermediate level must be."""
+
+    resample: str
+    reducing_gap: float
+
+
+# Quality presets, fastest first. A smaller reducing gap resamples from smaller intermediates.
+QUALITY_PRESETS = {
+    "fast": Quality("BILINEAR", 1.5),
+    "balanced": Quality("BICUBIC", 2.0),
+    "best": Quality("LANCZOS", 3.0),
+}
+DEFAULT_QUALITY = "balanced"
+
+
+def get_quality(name: str) -> Quality:
+    """Get a quality preset by name."""
+    try:
+        return QUALITY_PRESETS[name]
+    except KeyError:
+        raise FaviconsError(
+            "Unknown quality '{name}'. Must be one of {presets}.",
+            name=name,
+            presets=", ".join(QUALITY_PRESETS),
+        ) from None
+
+
+def fit_size(source: Size, target: Size) -> Size:
+    """Get the largest size fitting in target with source's aspect ratio.
+
+    Mirrors the sizing logic of `PIL.Image.Image.thumbnail`, including never upscaling.
+    """
+    src_x, src_y = source
+    x, y = target
+
+    if x >= src_x and y >= src_y:
+        return source
+
+    def round_aspect(number: float, key: Callable) -> int:
+        return max(min(math.floor(number), math.ceil(number), key=key), 1)
+
+    aspect = src_x / src_y
+    if x / y >= aspect:
+        x = round_aspect(y * aspect, key=lambda n: abs(aspect - n / y))
+    else:
+        y = round_aspect(x / aspect, key=lambda n: 0 if n == 0 else abs(aspect - x / n))
+    return (x, y)
+
+
+def flatten(image: "PILImage.Image", background: Tuple[int, int, int]) -> "PILImage.Image":
+    """Blend an RGBA image over an opaque background color."""
+    # Third Party
+    from PIL import Image as PILImage
+
+    flattened = PILImage.new("RGBA", image.size, background)
+    flattened.alpha_composite(image)
+    return flattened
+
+
+def plan_sizes(source: Size, targets: Iterable[Size]) -> List[Size]:
+    """Get the distinct output sizes for a set of targets, largest first."""
+    sizes = {fit_size(source, target) for target in targets}
+    return sorted(sizes, key=lambda s: (s[0] * s[1], s), reverse=True)
+
+
+class ResizePyramid:
+    """Derive every requested size from the nearest larger intermediate image.
+
+    Intermediates are built once, up front, by halving the master with `Image.reduce`, so only
+    the first reduction touches every source pixel. Each output is then a single resample from
+    the smallest intermediate that is still at least `reducing_gap` times its size, which matches
+    the two-step resize `Image.thumbnail` performs against the full-size source.
+    """
+
+    def __init__(
+        self,
+        master: "PILImage.Image",
+        targets: Iterable[Size],
+        resample: Optional["PILImage.Resampling"] = None,
+        reducing_gap: float = 2.0,
+        source_size: Optional[Size] = None,
+        background: Optional[Tuple[int, int, int]] = None,
+    ) -> None:
+        """Plan output sizes & build intermediate levels. Resamples with bicubic by default.
+
+        If the master was reduced from a larger source, output sizes are fitted to source_size
+        so they match those of the full-size source. With a background color, each level is
+        flattened onto it the first time it's used, since blending commutes with resampling.
+        """
+        # Third Party
+        from PIL import Image as PILImage
+
+        self.master = master
+        self.resample = PILImage.Resampling.BICUBIC if resample is None else resample
+        self.reducing_gap = reducing_gap
+        self.source_size = source_size or master.size
+        self.sizes = plan_sizes(self.source_size, targets)
+        self.background = background
+        self._levels: List[Tuple[int, "PILImage.Image"]] = [(1, master)]
+        self._flattened: Dict[int, "PILImage.Image"] = {}
+        self._lock = threading.Lock()
+
+        if self.sizes:
+            self._build_levels(self.sizes[-1])
+
+    def _fits(self, factor: int, size: Size) -> bool:
+        """Determine if a level reduced by factor is still large enough for size."""
+        width, height = self.master.size
+        return (
+            width / factor >= size[0] * self.reducing_gap
+            and height / factor >= size[1] * self.reducing_gap
+        )
+
+    def _build_levels(self, smallest: Size) -> None:
+        """Halve the master until the next level would be too small for the smallest size."""
+        factor, level = self._levels[-1]
+        while self._fits(factor * 2, smallest):
+            level = level.reduce(2)
+            factor *= 2
+            self._levels.append((factor, level))
+
+    def _level_for(self, size: Size) -> Tuple[int, "PILImage.Image"]:
+        """Get the smallest intermediate level usable for size."""
+        for factor, level in reversed(self._levels):
+            if factor == 1 or self._fits(factor, size):
+                return factor, level
+        return self._levels[0]
+
+    def _flatten(self, factor: int, level: "PILImage.Image") -> "PILImage.Image":
+        """Get a level blended over the background color, if there is one."""
+        if self.background is None:
+            return level
+        with self._lock:
+            if factor not in self._flattened:
+                self._flattened[factor] = flatten(level, self.background)
+            return self._flattened[factor]
+
+    def source_for(self, target: Size) -> Tuple["PILImage.Image", Optional[Box], Size]:
+        """Get the intermediate image, source box & output size to resample for target."""
+        size = fit_size(self.source_size, target)
+        if size == self.master.size:
+            return self._flatten(1, self.master), None, size
+
+        factor, level = self._level_for(size)
+        width, height = self.master.size
+        # Map the full source area onto the level's coordinates, as `Image.resize` does after its
+        # own reduction step, so odd dimensions don't shift the output.
+        return self._flatten(factor, level), (0.0, 0.0, width / factor, height / factor), size
+
+    def resize(self, target: Size) -> "PILImage.Image":
+        """Get a new image fitting within target, preserving aspect ratio."""
+        level, box, size = self.source_for(target)
+        return level.resize(size, self.resample, box=box)
+
+    def close(self) -> None:
+        """Free intermediate & flattened levels (but not the master)."""
+        for factor, level in self._levels:
+            if factor != 1:
+                level.close()
+        for level in self._flattened.values():
+            level.close()
+        self._levels = [(1, self.master)]
+        self._flattened = {}
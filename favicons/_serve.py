@@ -0,0 +1,284 @@
+"""Serve favicons on demand from a WSGI or ASGI app, without writing them to disk."""
+
+# Standard Library
+import threading
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    List,
+    Tuple,
+    Callable,
+    Iterable,
+    Optional,
+    Awaitable,
+    NamedTuple,
+)
+from collections import OrderedDict
+
+# Project
+from favicons._util import hash_bytes
+from favicons._types import FaviconProperties
+from favicons._generate import Favicons, LooseSource
+
+if TYPE_CHECKING:
+    # Standard Library
+    from concurrent.futures import Future
+
+Headers = List[Tuple[str, str]]
+WSGIApp = Callable[[Dict[str, Any], Callable], Iterable[bytes]]
+ASGIApp = Callable[[Dict[str, Any], Callable, Callable], Awaitable[None]]
+
+DEFAULT_CACHE_BYTES = 8 * 1024 * 1024
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+CONTENT_TYPES = {"ico": "image/x-icon"}
+
+STATUS_TEXT = {200: "OK", 304: "Not Modified", 404: "Not Found", 405: "Method Not Allowed"}
+
+
+class CachedIcon(NamedTuple):
+    """An encoded favicon & its entity tag."""
+
+    data: bytes
+    etag: str
+
+
+class Response(NamedTuple):
+    """A framework-neutral HTTP response."""
+
+    status: int
+    headers: Headers
+    body: bytes = b""
+
+
+class IconCache:
+    """Least recently used cache of encoded favicons, bounded by their total size in bytes."""
+
+    def __init__(self, max_bytes: int = DEFAULT_CACHE_BYTES) -> None:
+        """Create an empty cache."""
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._items: "OrderedDict[str, CachedIcon]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Count cached favicons."""
+        return len(self._items)
+
+    def get(self, name: str) -> Optional[CachedIcon]:
+        """Get a cached favicon, marking it most recently used."""
+        with self._lock:
+            icon = self._items.get(name)
+            if icon is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(name)
+            self.hits += 1
+            return icon
+
+    def put(self, name: str, icon: CachedIcon) -> None:
+        """Cache a favicon, evicting the least recently used until it fits."""
+        if len(icon.data) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._items.pop(name, None)
+            if previous is not None:
+                self.size -= len(previous.data)
+            while self._items and self.size + len(icon.data) > self.max_bytes:
+                _, evicted = self._items.popitem(last=False)
+                self.size -= len(evicted.data)
+                self.evictions += 1
+            self._items[name] = icon
+            self.size += len(icon.data)
+
+
+class FaviconServer:
+    """Render favicons on request, at the URLs `Favicons.filenames_gen(prefix=True)` names.
+
+    Encoded favicons are kept in an `IconCache` of at most `max_bytes`. Concurrent requests for
+    a favicon that isn't cached share a single render. Entity tags outlive cache evictions, so
+    conditional requests are always answered with a 304 without rendering or encoding.
+
+    Responses are `Cache-Control: immutable` if `fingerprint` is passed through to `Favicons`,
+    or else must be revalidated, unless `cache_control` says otherwise.
+    """
+
+    def __init__(
+        self,
+        source: LooseSource,
+        max_bytes: int = DEFAULT_CACHE_BYTES,
+        cache_control: Optional[str] = None,
+        **kwargs: Any,
+    ) -> None:
+        """Map each favicon's URL to its format."""
+        self.favicons = Favicons(source, **kwargs)
+        self.favicons._validate()
+        self.cache = IconCache(max_bytes)
+        self.cache_control = cache_control or (
+            IMMUTABLE if self.favicons.fingerprint else REVALIDATE
+        )
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        self._pending: Dict[str, "Future[CachedIcon]"] = {}
+        self._etags: Dict[str, str] = {}
+
+        if self.favicons.fingerprint:
+            # Fingerprints are content hashes, so every favicon has to be rendered to name them.
+            for fmt, data in self.favicons._render_gen():
+                name = self.favicons._output_name(fmt, data)
+                self._store(self.favicons.base_url + name, data)
+
+        self.routes: Dict[str, FaviconProperties] = dict(
+            zip(self.favicons.filenames_gen(prefix=True), self.favicons._formats, strict=True)
+        )
+
+    def close(self) -> None:
+        """Free the decoded source."""
+        self.favicons.close()
+
+    def _store(self, path: str, data: bytes) -> CachedIcon:
+        """Cache an encoded favicon & remember its entity tag."""
+        icon = CachedIcon(data, f'"{hash_bytes(data)[:16]}"')
+        self._etags[path] = icon.etag
+        self.cache.put(path, icon)
+        return icon
+
+    def _render(self, path: str, format_properties: FaviconProperties) -> CachedIcon:
+        """Render a favicon, or wait for a render of it already in progress."""
+        # Standard Library
+        from concurrent.futures import Future
+
+        with self._lock:
+            icon = self.cache.get(path)
+            if icon is not None:
+                return icon
+            future = self._pending.get(path)
+            owner = future is None
+            if future is None:
+                future = self._pending[path] = Future()
+        if not owner:
+            return future.result()
+
+        try:
+            with self._load_lock:
+                self.favicons._load_pyramid()
+            data = dict(self.favicons._render_gen((format_properties,)))[format_properties]
+            icon = self._store(path, data)
+            future.set_result(icon)
+            return icon
+        except BaseException as err:
+            future.set_exception(err)
+            raise
+        finally:
+            with self._lock:
+                del self._pending[path]
+
+    def get(self, path: str) -> Optional[CachedIcon]:
+        """Get the encoded favicon served at path, rendering it if needed."""
+        format_properties = self.routes.get(path)
+        if format_properties is None:
+            return None
+        return self._render(path, format_properties)
+
+    @staticmethod
+    def _matches(etag: str, if_none_match: str) -> bool:
+        """Determine if an If-None-Match header matches an entity tag, by weak comparison."""
+        tags = (t.strip().removeprefix("W/") for t in if_none_match.split(","))
+        return any(t in ("*", etag) for t in tags)
+
+    def respond(
+        self, method: str, path: str, if_none_match: Optional[str] = None
+    ) -> Optional[Response]:
+        """Respond to a request, or return None if path isn't a favicon."""
+        format_properties = self.routes.get(path)
+        if format_properties is None:
+            return None
+        if method not in ("GET", "HEAD"):
+            return Response(405, [("Allow", "GET, HEAD")])
+
+        etag = self._etags.get(path)
+        if etag is not None and if_none_match and self._matches(etag, if_none_match):
+            return Response(304, [("ETag", etag), ("Cache-Control", self.cache_control)])
+
+        icon = self._render(path, format_properties)
+        if if_none_match and self._matches(icon.etag, if_none_match):
+            return Response(304, [("ETag", icon.etag), ("Cache-Control", self.cache_control)])
+
+        image_fmt = format_properties.image_fmt
+        headers = [
+            ("Content-Type", CONTENT_TYPES.get(image_fmt, f"image/{image_fmt}")),
+            ("Content-Length", str(len(icon.data))),
+            ("ETag", icon.etag),
+            ("Cache-Control", self.cache_control),
+        ]
+        return Response(200, headers, b"" if method == "HEAD" else icon.data)
+
+    def wsgi(self, app: Optional[WSGIApp] = None) -> WSGIApp:
+        """Get a WSGI app serving favicons, passing other requests to app (or 404ing them)."""
+
+        def favicons_wsgi(environ: Dict[str, Any], start_response: Callable) -> Iterable[bytes]:
+            response = self.respond(
+                environ.get("REQUEST_METHOD", "GET"),
+                environ.get("PATH_INFO", ""),
+                environ.get("HTTP_IF_NONE_MATCH"),
+            )
+            if response is None:
+                if app is not None:
+                    return app(environ, start_response)
+                response = Response(404, [("Content-Length", "0")])
+            start_response(f"{response.status} {STATUS_TEXT[response.status]}", response.headers)
+            return [response.body]
+
+        return favicons_wsgi
+
+    def asgi(self, app: Optional[ASGIApp] = None) -> ASGIApp:
+        """Get an ASGI app serving favicons, passing other requests to app (or 404ing them).
+
+        Renders run on the event loop's default executor.
+        """
+        # Standard Library
+        import asyncio
+
+        async def favicons_asgi(scope: Dict[str, Any], receive: Callable, send: Callable) -> None:
+            if scope["type"] != "http":
+                if app is not None:
+                    await app(scope, receive, send)
+                elif scope["type"] == "lifespan":
+                    while True:
+                        message = await receive()
+                        if message["type"] == "lifespan.startup":
+                            await send({"type": "lifespan.startup.complete"})
+                        elif message["type"] == "lifespan.shutdown":
+                            await send({"type": "lifespan.shutdown.complete"})
+                            break
+                return
+
+            headers = dict(scope.get("headers", ()))
+            if_none_match = headers.get(b"if-none-match")
+            response = await asyncio.get_running_loop().run_in_executor(
+                None,
+                self.respond,
+                scope["method"],
+                scope["path"],
+                if_none_match.decode("latin-1") if if_none_match else None,
+            )
+            if response is None:
+                if app is not None:
+                    await app(scope, receive, send)
+                    return
+                response = Response(404, [("Content-Length", "0")])
+
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": response.status,
+                    "headers": [(k.lower().encode(), v.encode()) for k, v in response.headers],
+                }
+            )
+            await send({"type": "http.response.body", "body": response.body})
+
+        return favicons_asgi
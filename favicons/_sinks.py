@@ -0,0 +1,268 @@
+"""Destinations for rendered favicons."""
+
+# Standard Library
+import io
+import os
+from types import TracebackType
+from typing import IO, TYPE_CHECKING, Dict, List, Type, Tuple, Union, BinaryIO, Optional
+from pathlib import Path
+
+# Project
+from favicons._exceptions import FaviconsError
+
+if TYPE_CHECKING:
+    # Standard Library
+    import tarfile
+    import zipfile
+
+
+class Sink:
+    """Base class for favicon output sinks.
+
+    A sink is opened before a generation run, receives each rendered favicon via `write`, and is
+    committed once every favicon has been written. If the run fails or is abandoned, the sink is
+    aborted instead. Used as a context manager, this happens automatically.
+    """
+
+    def open(self) -> None:
+        """Prepare the sink for a new run."""
+
+    def write(self, name: str, data: bytes) -> None:
+        """Write a single rendered favicon."""
+        raise NotImplementedError
+
+    def commit(self) -> None:
+        """Finish a successful run."""
+
+    def abort(self) -> None:
+        """Clean up after a failed or abandoned run."""
+
+    def __enter__(self) -> "Sink":
+        """Open the sink."""
+        self.open()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]] = None,
+        exc_value: Optional[BaseException] = None,
+        traceback: Optional[TracebackType] = None,
+    ) -> None:
+        """Commit the sink, or abort it if an exception occurred."""
+        if exc_type is None:
+            self.commit()
+        else:
+            self.abort()
+
+
+class DirectorySink(Sink):
+    """Write favicons to files in a directory.
+
+    With `atomic` (the default), each favicon is first written to a temporary file alongside its
+    destination, and every temporary file is renamed into place only once the whole set has been
+    written. A crash part way through never leaves a partially overwritten set behind.
+
+    With `skip_unchanged` (the default), files whose contents would be identical are left alone,
+    so their modification times don't change.
+    """
+
+    def __init__(
+        self, directory: Union[Path, str], atomic: bool = True, skip_unchanged: bool = True
+    ) -> None:
+        """Set the output directory."""
+        self.directory = Path(directory)
+        self.atomic = atomic
+        self.skip_unchanged = skip_unchanged
+        self._pending: List[Tuple[Path, Path]] = []
+
+    def open(self) -> None:
+        """Create the output directory if needed."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._pending = []
+
+    def write(self, name: str, data: bytes) -> None:
+        """Write a favicon, or stage it in a temporary file."""
+        destination = self.directory / name
+        if self.skip_unchanged and self._unchanged(destination, data):
+            return
+
+        if not self.atomic:
+            destination.write_bytes(data)
+            return
+
+        # Standard Library
+        from tempfile import mkstemp
+
+        fd, temp_name = mkstemp(prefix=f".{name}.", suffix=".tmp", dir=self.directory)
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        self._pending.append((Path(temp_name), destination))
+
+    @staticmethod
+    def _unchanged(destination: Path, data: bytes) -> bool:
+        """Determine if a file already has exactly this content."""
+        try:
+            if destination.stat().st_size != len(data):
+                return False
+            return destination.read_bytes() == data
+        except OSError:
+            return False
+
+    def commit(self) -> None:
+        """Move staged favicons into place."""
+        for temp, destination in self._pending:
+            os.replace(temp, destination)
+        self._pending = []
+
+    def abort(self) -> None:
+        """Remove staged favicons, leaving any existing set untouched."""
+        for temp, _ in self._pending:
+            temp.unlink(missing_ok=True)
+        self._pending = []
+
+
+class MemorySink(Sink):
+    """Collect favicons in a dict of file name to encoded image."""
+
+    def __init__(self) -> None:
+        """Create an empty collection."""
+        self.files: Dict[str, bytes] = {}
+
+    def write(self, name: str, data: bytes) -> None:
+        """Store a favicon."""
+        self.files[name] = data
+
+
+class _ArchiveSink(Sink):
+    """Stream favicons into a single archive written to a path or a binary file-like object.
+
+    When the target is a path, the archive is written to a temporary file & renamed into place
+    on commit. File-like targets, such as `sys.stdout.buffer`, may be unseekable & are left open.
+    """
+
+    def __init__(self, target: Union[Path, str, BinaryIO]) -> None:
+        """Set the archive target."""
+        self.target = Path(target) if isinstance(target, str) else target
+        self._temp: Optional[Path] = None
+        self._stream: Optional[IO[bytes]] = None
+
+    def _open_archive(self, stream: IO[bytes]) -> None:
+        raise NotImplementedError
+
+    def _close_archive(self) -> None:
+        raise NotImplementedError
+
+    def open(self) -> None:
+        """Open the archive for writing."""
+        if isinstance(self.target, Path):
+            # Standard Library
+            from tempfile import mkstemp
+
+            self.target.parent.mkdir(parents=True, exist_ok=True)
+            fd, temp_name = mkstemp(
+                prefix=f".{self.target.name}.", suffix=".tmp", dir=self.target.parent
+            )
+            self._temp = Path(temp_name)
+            self._stream = os.fdopen(fd, "wb")
+            self._open_archive(self._stream)
+        else:
+            self._open_archive(self.target)
+
+    def commit(self) -> None:
+        """Finish the archive & move it into place."""
+        self._close_archive()
+        if self._stream is not None:
+            self._stream.close()
+            self._stream = None
+        if self._temp is not None and isinstance(self.target, Path):
+            os.replace(self._temp, self.target)
+            self._temp = None
+
+    def abort(self) -> None:
+        """Discard the archive if it was being written to a path."""
+        self._close_archive()
+        if self._stream is not None:
+            self._stream.close()
+            self._stream = None
+        if self._temp is not None:
+            self._temp.unlink(missing_ok=True)
+            self._temp = None
+
+
+class ZipSink(_ArchiveSink):
+    """Stream favicons into a zip archive.
+
+    Favicons are already compressed images, so entries are stored rather than deflated.
+    """
+
+    _archive: Optional["zipfile.ZipFile"] = None
+
+    def _open_archive(self, stream: IO[bytes]) -> None:
+        # Standard Library
+        import zipfile
+
+        self._archive = zipfile.ZipFile(stream, mode="w", compression=zipfile.ZIP_STORED)
+
+    def _close_archive(self) -> None:
+        if self._archive is not None:
+            self._archive.close()
+            self._archive = None
+
+    def write(self, name: str, data: bytes) -> None:
+        """Add a favicon to the archive."""
+        if self._archive is None:
+            raise FaviconsError("{} must be opened before writing.", self.__class__.__name__)
+        self._archive.writestr(name, data)
+
+
+class TarSink(_ArchiveSink):
+    """Stream favicons into a tar archive, gzip-compressed if `compression` is "gz"."""
+
+    _archive: Optional["tarfile.TarFile"] = None
+
+    def __init__(self, target: Union[Path, str, BinaryIO], compression: str = "") -> None:
+        """Set the archive target & compression."""
+        super().__init__(target)
+        self.compression = compression
+
+    def _open_archive(self, stream: IO[bytes]) -> None:
+        # Standard Library
+        import tarfile
+
+        if self.compression == "gz":
+            self._archive = tarfile.open(fileobj=stream, mode="w|gz")
+        else:
+            self._archive = tarfile.open(fileobj=stream, mode="w|")
+
+    def _close_archive(self) -> None:
+        if self._archive is not None:
+            self._archive.close()
+            self._archive = None
+
+    def write(self, name: str, data: bytes) -> None:
+        """Add a favicon to the archive."""
+        if self._archive is None:
+            raise FaviconsError("{} must be opened before writing.", self.__class__.__name__)
+        # Standard Library
+        import tarfile
+
+        info = tarfile.TarInfo(name)
+        info.size = len(data)
+        self._archive.addfile(info, io.BytesIO(data))
+
+
+def archive_sink(target: Union[Path, str, BinaryIO], name: Optional[str] = None) -> Sink:
+    """Get a zip or tar sink based on a file name's extension (.zip, .tar, .tar.gz or .tgz)."""
+    if name is None:
+        name = str(target)
+    name = name.lower()
+    if name.endswith(".zip"):
+        return ZipSink(target)
+    if name.endswith((".tar.gz", ".tgz")):
+        return TarSink(target, compression="gz")
+    if name.endswith(".tar"):
+        return TarSink(target)
+    raise FaviconsError(
+        "Unable to determine archive type of '{name}'. Must be one of .zip, .tar, .tar.gz or .tgz.",
+        name=name,
+    )
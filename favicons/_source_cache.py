@@ -0,0 +1,142 @@
+"""Share decoded sources between Favicons instances, across a whole process."""
+
+# Standard Library
+import threading
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Tuple,
+    Union,
+    BinaryIO,
+    Optional,
+    NamedTuple,
+)
+from pathlib import Path
+from collections import OrderedDict
+
+# Project
+from favicons._svg import SvgSource
+from favicons._util import hash_file, hash_stream
+from favicons._resize import Size
+
+if TYPE_CHECKING:
+    # Third Party
+    from PIL import Image as PILImage
+
+DEFAULT_SOURCE_CACHE_BYTES = 256 * 1024 * 1024
+
+SourceKey = Tuple[Any, ...]
+
+
+class DecodedSource(NamedTuple):
+    """A decoded RGBA master & the size of the source it was decoded from."""
+
+    master: "PILImage.Image"
+    source_size: Size
+
+
+CachedSource = Union[DecodedSource, SvgSource]
+
+
+def source_bytes(source: CachedSource) -> int:
+    """Estimate the memory a cached source holds."""
+    if isinstance(source, SvgSource):
+        return source.nbytes
+    width, height = source.master.size
+    return width * height * len(source.master.getbands())
+
+
+class SourceCache:
+    """Least recently used cache of decoded sources, bounded by their estimated size in bytes.
+
+    Sources are keyed by a digest of their contents, so a file is only decoded again once it
+    changes. A file's digest is kept for as long as its modification time & size are the same.
+    Evicted sources are never closed, since Favicons instances may still be rendering them.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_SOURCE_CACHE_BYTES) -> None:
+        """Create an empty cache."""
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._items: "OrderedDict[SourceKey, Tuple[CachedSource, int]]" = OrderedDict()
+        # Each file's latest modification time, size & digest.
+        self._digests: Dict[Path, Tuple[int, int, str]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Count cached sources."""
+        return len(self._items)
+
+    def digest(self, source: Union[Path, BinaryIO]) -> str:
+        """Get the digest of a source's contents, hashing files only when they've changed."""
+        if not isinstance(source, Path):
+            return hash_stream(source)
+        stat = source.stat()
+        path = source.resolve()
+        with self._lock:
+            memo = self._digests.get(path)
+        if memo is not None and memo[:2] == (stat.st_mtime_ns, stat.st_size):
+            return memo[2]
+        digest = hash_file(source)
+        with self._lock:
+            # Replaces the previous version's digest, so only one is kept per file.
+            self._digests[path] = (stat.st_mtime_ns, stat.st_size, digest)
+        return digest
+
+    def get(self, key: SourceKey) -> Optional[CachedSource]:
+        """Get a cached source, marking it most recently used."""
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return item[0]
+
+    def put(self, key: SourceKey, source: CachedSource) -> None:
+        """Cache a source, or update its size, evicting the least recently used until it fits."""
+        size = source_bytes(source)
+        with self._lock:
+            previous = self._items.pop(key, None)
+            if previous is not None:
+                self.size -= previous[1]
+            if size > self.max_bytes:
+                return
+            while self._items and self.size + size > self.max_bytes:
+                _, (_, evicted) = self._items.popitem(last=False)
+                self.size -= evicted
+                self.evictions += 1
+            self._items[key] = (source, size)
+            self.size += size
+
+    def clear(self) -> None:
+        """Forget every cached source & file digest."""
+        with self._lock:
+            self._items.clear()
+            self._digests.clear()
+            self.size = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Get hit, miss & eviction counts, & the cache's current & maximum size."""
+        with self._lock:
+            return {
+                "entries": len(self._items),
+                "size": self.size,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+_SOURCE_CACHE = SourceCache()
+
+
+def get_source_cache() -> SourceCache:
+    """Get the process-wide source cache used by `Favicons(source_cache=True)`."""
+    return _SOURCE_CACHE
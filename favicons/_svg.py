@@ -0,0 +1,137 @@
+"""Render SVG sources natively at each output size."""
+
+# Standard Library
+import copy
+import threading
+from typing import TYPE_CHECKING, Dict, List, Tuple, Union, BinaryIO, Iterator, Optional
+from pathlib import Path
+from contextlib import contextmanager
+
+# Project
+from favicons._resize import Box, Size
+from favicons._exceptions import FaviconsError
+
+if TYPE_CHECKING:
+    # Third Party
+    from PIL import Image as PILImage
+    from reportlab.graphics.shapes import Drawing
+
+
+def default_backend() -> str:
+    """Prefer the Cairo renderer, which is faster than reportlab's built-in renderPM."""
+    try:
+        # Third Party
+        import rlPyCairo  # noqa: F401
+
+        return "rlPyCairo"
+    except ImportError:
+        return "_renderPM"
+
+
+class SvgSource:
+    """A parsed SVG drawing, rasterized on demand at exactly each output size.
+
+    The document is parsed once. Rendering the vector directly at each size is sharper for small
+    icons & cheaper for large viewBoxes than rasterizing once at the intrinsic size and
+    downscaling. Rasters are cached per size, so formats sharing dimensions render once.
+    """
+
+    def __init__(
+        self,
+        svg: Union[Path, BinaryIO],
+        backend: Optional[str] = None,
+    ) -> None:
+        """Parse the SVG document."""
+        # Third Party
+        from PIL import Image as PILImage
+        from svglib.svglib import svg2rlg
+
+        self.drawing = svg2rlg(str(svg) if isinstance(svg, Path) else svg)
+        if self.drawing is None or not self.drawing.width or not self.drawing.height:
+            raise FaviconsError("Unable to parse SVG {}", str(svg))
+
+        self.size: Size = (round(self.drawing.width), round(self.drawing.height))
+        self.backend = backend or default_backend()
+        # Outputs are rendered at their final size, so no further resampling takes place.
+        self.resample = PILImage.Resampling.BICUBIC
+        self._rendered: Dict[Size, "PILImage.Image"] = {}
+        # Guards the caches; each size has its own lock, so different sizes render in parallel.
+        self._lock = threading.Lock()
+        self._size_locks: Dict[Size, threading.Lock] = {}
+        # Rendering annotates a drawing's shapes, so each concurrent render uses its own copy, &
+        # copies are made from the parsed drawing, which is never rendered.
+        self._spare_drawings: List["Drawing"] = []
+
+    def rasterize(self, target: Size) -> "PILImage.Image":
+        """Render the drawing as large as possible within target, preserving aspect ratio."""
+        # Third Party
+        from reportlab.graphics import renderPM
+
+        scale = min(target[0] / self.drawing.width, target[1] / self.drawing.height)
+        # Matches the pixel size reportlab's canvas produces for this scale.
+        size = (int(self.drawing.width * scale + 0.5), int(self.drawing.height * scale + 0.5))
+
+        with self._lock:
+            image = self._rendered.get(size)
+            if image is not None:
+                return image
+            size_lock = self._size_locks.setdefault(size, threading.Lock())
+
+        with size_lock:
+            with self._lock:
+                image = self._rendered.get(size)
+            if image is None:
+                with self._borrow_drawing() as drawing:
+                    on_black, on_white = (
+                        renderPM.drawToPIL(drawing, dpi=72 * scale, bg=bg, backend=self.backend)
+                        for bg in (0x000000, 0xFFFFFF)
+                    )
+                image = self._extract_alpha(on_black, on_white)
+                with self._lock:
+                    self._rendered[size] = image
+        return image
+
+    @contextmanager
+    def _borrow_drawing(self) -> Iterator["Drawing"]:
+        """Use a copy of the drawing no other thread is rendering."""
+        with self._lock:
+            drawing = self._spare_drawings.pop() if self._spare_drawings else None
+        if drawing is None:
+            drawing = copy.deepcopy(self.drawing)
+        try:
+            yield drawing
+        finally:
+            with self._lock:
+                self._spare_drawings.append(drawing)
+
+    @staticmethod
+    def _extract_alpha(on_black: "PILImage.Image", on_white: "PILImage.Image") -> "PILImage.Image":
+        """Recover an RGBA image from renders of the same drawing on black & on white.
+
+        Where the drawing is opaque both renders match; where it's fully transparent they differ
+        by 255. Rendered on black, color channels are already premultiplied by alpha.
+        """
+        # Third Party
+        from PIL import Image as PILImage
+        from PIL import ImageChops
+
+        alpha = ImageChops.invert(ImageChops.subtract(on_white, on_black).convert("L"))
+        return PILImage.merge("RGBa", (*on_black.split(), alpha)).convert("RGBA")
+
+    @property
+    def nbytes(self) -> int:
+        """Estimate the memory held by cached rasters."""
+        with self._lock:
+            return sum(width * height * 4 for width, height in self._rendered)
+
+    def source_for(self, target: Size) -> Tuple["PILImage.Image", Optional[Box], Size]:
+        """Get the raster for target, which needs no further resizing."""
+        image = self.rasterize(target)
+        return image, None, image.size
+
+    def close(self) -> None:
+        """Free cached rasters (but keep the parsed drawing)."""
+        with self._lock:
+            for image in self._rendered.values():
+                image.close()
+            self._rendered = {}
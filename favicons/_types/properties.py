@@ -2,21 +2,47 @@
 
 # Standard Library
 import json as _json
-from typing import Tuple, Mapping, Optional
+from typing import Any, Tuple, Mapping, Optional
+
+# Project
+from favicons._constants import HTML_LINK
 
 
 class FaviconProperties:
-    """Data Model for Favicon Properties."""
+    """Data Model for Favicon Properties.
+
+    Instances are immutable, so the file name & HTML link are computed once, up front.
+    """
+
+    __slots__ = ("image_fmt", "rel", "dimensions", "prefix", "filename", "_link")
+
+    image_fmt: str
+    rel: Optional[str]
+    dimensions: Tuple[int, int]
+    prefix: str
+    filename: str
+    _link: str
 
     def __init__(
-        self, image_fmt: str, dimensions: Tuple[int, int], prefix: str, rel: Optional[str] = None,
+        self, image_fmt: str, dimensions: Tuple[int, int], prefix: str, rel: Optional[str] = None
     ) -> None:
         """Set properties."""
+        set_attr = super().__setattr__
+        set_attr("image_fmt", image_fmt)
+        set_attr("rel", rel)
+        set_attr("dimensions", (int(dimensions[0]), int(dimensions[1])))
+        set_attr("prefix", prefix)
+        set_attr("filename", self._get_filename_parts())
+        # Everything but the href, which depends on the base URL.
+        set_attr("_link", HTML_LINK.format(rel=rel, type=f"image/{image_fmt}", href="{href}"))
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        """Prevent changes that would invalidate precomputed values."""
+        raise AttributeError(f"{self.__class__.__name__} is immutable.")
 
-        self.image_fmt = image_fmt
-        self.rel = rel
-        self.dimensions = dimensions
-        self.prefix = prefix
+    def __reduce__(self) -> Tuple[Any, ...]:
+        """Rebuild from the constructor's arguments when pickled or copied."""
+        return (self.__class__, (self.image_fmt, self.dimensions, self.prefix, self.rel))
 
     @property
     def width(self) -> int:
@@ -28,6 +54,15 @@ class FaviconProperties:
         """Height from dimensions."""
         return self.dimensions[1]
 
+    @property
+    def render_key(self) -> Tuple[Tuple[int, int], str]:
+        """Identify formats whose rendered images are identical."""
+        return (self.dimensions, self.image_fmt)
+
+    def html(self, base_url: str = "/", filename: Optional[str] = None) -> str:
+        """Get the HTML link element for this favicon, optionally written to another file name."""
+        return self._link.format(href=base_url + (filename or self.filename))
+
     def __repr__(self) -> str:
         """Representation of instance."""
         attr_names = (a for a in self.__dir__() if not a.startswith("_"))
@@ -36,7 +71,17 @@ class FaviconProperties:
 
     def __str__(self) -> str:
         """Represent instance as string."""
-        return self._get_filename_parts()
+        return self.filename
+
+    def __eq__(self, other: object) -> bool:
+        """Compare by value."""
+        if not isinstance(other, FaviconProperties):
+            return NotImplemented
+        return self.dict() == other.dict()
+
+    def __hash__(self) -> int:
+        """Hash by value."""
+        return hash((self.image_fmt, self.dimensions, self.prefix, self.rel))
 
     def dict(self) -> Mapping:
         """Represent instance as dict."""
@@ -1,15 +1,22 @@
 """Common utility functions used throughout Favicons."""
 
 # Standard Library
-from typing import Union, Mapping, Generator
+import re
+import codecs
+import hashlib
+from typing import Union, BinaryIO
 from pathlib import Path
-from tempfile import mkstemp
 
 # Project
-from favicons._types import Color, FaviconProperties
-from favicons._constants import ICON_TYPES
 from favicons._exceptions import FaviconsError, FaviconNotFoundError
 
+# Anything allowed before an XML document's root element: a byte order mark, whitespace, the XML
+# declaration, processing instructions, comments & a DOCTYPE, with or without an internal subset.
+XML_PROLOG = re.compile(
+    rb"\xef\xbb\xbf|\s+|<\?.*?\?>|<!--.*?-->|<!DOCTYPE(?:[^\[>]|\[.*?\])*>", re.S | re.I
+)
+SVG_ROOT = re.compile(rb"<(?:[\w.-]+:)?svg[\s/>]", re.I)
+
 
 def validate_path(path: Union[Path, str], must_exist: bool = True, create: bool = False) -> Path:
     """Validate a path and ensure it's a Path object."""
@@ -32,31 +39,54 @@ def validate_path(path: Union[Path, str], must_exist: bool = True, create: bool
     return path
 
 
-def generate_icon_types() -> Generator[FaviconProperties, None, None]:
-    """Get icon type objects."""
-    for icon_type in ICON_TYPES:
-        if isinstance(icon_type, Mapping):
-            yield FaviconProperties(**icon_type)
-
-
-def svg_to_png(svg_path: Path, background_color: Color) -> Path:
-    """Convert an SVG vector to a PNG file."""
-    # Third Party
-    from svglib.svglib import svg2rlg
-    from reportlab.graphics import renderPM
-    from reportlab.lib.colors import transparent
-
-    _, png_path = mkstemp(suffix=".tiff")
-
-    png = Path(png_path)
-
-    drawing = svg2rlg(str(svg_path))
-    renderPM.drawToFile(
-        drawing,
-        str(png),
-        fmt="TIFF",
-        bg=int(background_color.as_hex().replace("#", ""), 16),
-        configPIL={"transparent": transparent},
-    )
-
-    return png
+def hash_bytes(data: bytes) -> str:
+    """Get the SHA-256 hex digest of some bytes."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def hash_file(path: Path, chunk_size: int = 1 << 16) -> str:
+    """Get the SHA-256 hex digest of a file's contents."""
+    digest = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def hash_stream(stream: BinaryIO, chunk_size: int = 1 << 16) -> str:
+    """Get the SHA-256 hex digest of a stream's contents, leaving the stream position as is."""
+    position = stream.tell()
+    stream.seek(0)
+    digest = hashlib.sha256()
+    for chunk in iter(lambda: stream.read(chunk_size), b""):
+        digest.update(chunk)
+    stream.seek(position)
+    return digest.hexdigest()
+
+
+def is_svg(stream: BinaryIO, chunk_size: int = 4096) -> bool:
+    """Determine if an in-memory source is an SVG document, leaving the stream position as is.
+
+    The stream is read until its root element, however long the prolog before it is.
+    """
+    position = stream.tell()
+    head = b""
+    end = 0
+    try:
+        while True:
+            chunk = stream.read(chunk_size)
+            head += chunk
+            while (match := XML_PROLOG.match(head, end)) is not None:
+                end = match.end()
+            if SVG_ROOT.match(head, end):
+                return True
+            rest = head[end:]
+            # A byte order mark, comment, declaration or tag name that continues in the next chunk.
+            partial = codecs.BOM_UTF8.startswith(rest) or (
+                rest.startswith(b"<")
+                and (rest[:2] in (b"<?", b"<!") or re.search(rb"[\s/>]", rest) is None)
+            )
+            if not chunk or not partial:
+                return False
+    finally:
+        stream.seek(position)
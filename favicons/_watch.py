@@ -0,0 +1,190 @@
+"""Regenerate favicons whenever their source file changes."""
+
+# Standard Library
+import time
+import threading
+from types import TracebackType
+from typing import TYPE_CHECKING, Any, List, Type, Tuple, Iterator, Optional, NamedTuple
+from pathlib import Path
+
+# Project
+from favicons._util import validate_path
+from favicons._sinks import DirectorySink
+from favicons._generate import Favicons, LoosePath
+from favicons._fingerprint import prune_fingerprints
+from favicons._source_cache import SourceCache
+
+if TYPE_CHECKING:
+    # Standard Library
+    from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_INTERVAL = 0.25
+DEFAULT_DEBOUNCE = 0.2
+
+# A file's modification time, size & inode, or None if it doesn't exist.
+Signature = Optional[Tuple[int, int, int]]
+
+
+class WatchCycle(NamedTuple):
+    """Outcome of one regeneration."""
+
+    elapsed: float
+    written: Tuple[str, ...] = ()
+    unchanged: int = 0
+    error: Optional[Exception] = None
+    skipped: bool = False
+
+
+class ChangedSink(DirectorySink):
+    """Write only favicons whose bytes changed, recording which were written."""
+
+    def __init__(self, directory: LoosePath) -> None:
+        """Set the output directory."""
+        super().__init__(directory, skip_unchanged=False)
+        self.written: List[str] = []
+        self.unchanged = 0
+
+    def open(self) -> None:
+        """Start counting a new run's writes."""
+        super().open()
+        self.written = []
+        self.unchanged = 0
+
+    def write(self, name: str, data: bytes) -> None:
+        """Stage a favicon, unless its file already has exactly this content."""
+        if self._unchanged(self.directory / name, data):
+            self.unchanged += 1
+            return
+        self.written.append(name)
+        super().write(name, data)
+
+
+def signature(path: Path) -> Signature:
+    """Get what identifies a version of a file, without reading it."""
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+
+class Watcher:
+    """Poll a source file & regenerate favicons each time it changes.
+
+    The source is polled with `stat` every `interval` seconds. Once it changes, it has to stay
+    unchanged for `debounce` seconds, so an editor's multi-step save is regenerated once. Each
+    cycle only rewrites favicons whose bytes changed.
+
+    Decoded sources, SVG rasterizations & the thread pool are kept between cycles, so saving
+    a source without changing it, or switching back to a previous version, skips decoding.
+    Other keyword arguments are passed to `Favicons`.
+    """
+
+    def __init__(
+        self,
+        source: LoosePath,
+        output_directory: LoosePath,
+        interval: float = DEFAULT_INTERVAL,
+        debounce: float = DEFAULT_DEBOUNCE,
+        jobs: int = 1,
+        prune: bool = False,
+        **kwargs: Any,
+    ) -> None:
+        """Prepare to watch source."""
+        self.source = validate_path(source)
+        self.output_directory = Path(output_directory)
+        self.output_directory.mkdir(parents=True, exist_ok=True)
+        self.interval = interval
+        self.debounce = debounce
+        self.prune = prune
+        self.kwargs = kwargs
+        self.source_cache = SourceCache()
+        self.sink = ChangedSink(self.output_directory)
+        self._executor: Optional["ThreadPoolExecutor"] = None
+        if jobs > 1:
+            # Standard Library
+            from concurrent.futures import ThreadPoolExecutor
+
+            self._executor = ThreadPoolExecutor(max_workers=jobs)
+        self._digest: Optional[str] = None
+        self._stopped = threading.Event()
+
+    def __enter__(self) -> "Watcher":
+        """Use Watcher as a context manager."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]] = None,
+        exc_value: Optional[BaseException] = None,
+        traceback: Optional[TracebackType] = None,
+    ) -> None:
+        """Stop watching & shut down the thread pool."""
+        self.close()
+
+    def close(self) -> None:
+        """Stop watching & shut down the thread pool."""
+        self.stop()
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def stop(self) -> None:
+        """Stop watching, after any cycle in progress."""
+        self._stopped.set()
+
+    def cycle(self) -> WatchCycle:
+        """Regenerate favicons, unless the source's contents are the same as last cycle's."""
+        start = time.perf_counter()
+        try:
+            digest = self.source_cache.digest(self.source)
+            if digest == self._digest:
+                return WatchCycle(time.perf_counter() - start, skipped=True)
+            with Favicons(
+                self.source,
+                self.output_directory,
+                executor=self._executor,
+                sink=self.sink,
+                source_cache=self.source_cache,
+                **self.kwargs,
+            ) as favicons:
+                favicons.sgenerate()
+            if self.prune:
+                prune_fingerprints(self.output_directory)
+        except Exception as err:
+            # A source saved part way through an edit shouldn't end the watch.
+            return WatchCycle(time.perf_counter() - start, error=err)
+        self._digest = digest
+        return WatchCycle(
+            time.perf_counter() - start, tuple(self.sink.written), self.sink.unchanged
+        )
+
+    def changes(self, last: Signature) -> Iterator[None]:
+        """Yield each time the source changes & then stays unchanged for `debounce` seconds."""
+        while not self._stopped.wait(self.interval):
+            current = signature(self.source)
+            if current == last:
+                continue
+            settled = time.monotonic() + self.debounce
+            while not self._stopped.wait(min(self.interval, self.debounce)):
+                latest = signature(self.source)
+                if latest != current:
+                    current = latest
+                    settled = time.monotonic() + self.debounce
+                elif time.monotonic() >= settled:
+                    break
+            else:
+                return
+            last = current
+            # Editors that save by replacing the file may leave it missing for a moment.
+            if current is not None:
+                yield
+
+    def watch(self) -> Iterator[WatchCycle]:
+        """Regenerate favicons now & after each change, until stopped."""
+        self._stopped.clear()
+        # Changes made while the first cycle runs are picked up afterwards.
+        last = signature(self.source)
+        yield self.cycle()
+        for _ in self.changes(last):
+            yield self.cycle()
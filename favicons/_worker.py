@@ -0,0 +1,319 @@
+"""Generate favicon sets for jobs claimed from a spool directory shared between machines."""
+
+# Standard Library
+import os
+import json as _json
+import time
+import queue
+import signal
+import threading
+from typing import TYPE_CHECKING, Any, Dict, List, Union, Iterator, Optional, NamedTuple
+from pathlib import Path
+from datetime import datetime, timezone
+from tempfile import mkstemp
+from contextlib import contextmanager
+
+# Project
+from favicons._batch import BatchItem, _error, _parse_row, _generate_group
+from favicons._generate import LoosePath
+
+if TYPE_CHECKING:
+    # Standard Library
+    import multiprocessing
+    from multiprocessing.synchronize import Event
+
+JOB_SUFFIX = ".job"
+CLAIM_SUFFIX = ".claim"
+RESULT_SUFFIX = ".result.json"
+DONE_SUFFIX = ".done"
+FAILED_SUFFIX = ".failed"
+
+DEFAULT_POLL_INTERVAL = 1.0
+DEFAULT_STALE_AFTER = 300.0
+
+
+class JobResult(NamedTuple):
+    """Outcome of a spooled job, or a stale claim a worker put back in the spool."""
+
+    job: str
+    status: str
+    worker: str
+    elapsed: float = 0.0
+    error: Optional[Dict] = None
+
+    def dict(self) -> Dict:
+        """Represent result as a result record."""
+        return {
+            **self._asdict(),
+            "finished": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        }
+
+
+class WorkerStats:
+    """Throughput counters for a worker run."""
+
+    def __init__(self) -> None:
+        """Start counting."""
+        self.started = time.monotonic()
+        self.ok = 0
+        self.failed = 0
+        self.recovered = 0
+        self.busy = 0.0
+
+    def record(self, result: JobResult) -> None:
+        """Count a result."""
+        if result.status == "ok":
+            self.ok += 1
+        elif result.status == "error":
+            self.failed += 1
+        elif result.status == "recovered":
+            self.recovered += 1
+        self.busy += result.elapsed
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds since the run started."""
+        return time.monotonic() - self.started
+
+    @property
+    def jobs_per_sec(self) -> float:
+        """Finished jobs per second of wall time."""
+        return (self.ok + self.failed) / self.elapsed
+
+    def dict(self) -> Dict[str, Any]:
+        """Represent counters as a dict."""
+        return {
+            "ok": self.ok,
+            "failed": self.failed,
+            "recovered": self.recovered,
+            "elapsed": self.elapsed,
+            "busy": self.busy,
+            "jobs_per_sec": self.jobs_per_sec,
+        }
+
+
+def worker_id() -> str:
+    """Identify this process across every machine sharing a spool."""
+    # Standard Library
+    import socket
+
+    return f"{socket.gethostname()}-{os.getpid()}".replace(".", "-")
+
+
+def _write_json(path: Path, record: Dict) -> None:
+    """Atomically write a JSON record, so readers never see part of it."""
+    fd, temp_name = mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    with os.fdopen(fd, "w") as f:
+        _json.dump(record, f, indent=2, default=str)
+    os.replace(temp_name, path)
+
+
+def submit_job(spool: LoosePath, item: Union[BatchItem, Dict], name: Optional[str] = None) -> Path:
+    """Add a job to a spool directory, named so jobs are claimed in the order submitted.
+
+    Relative `source` & `output_directory` paths are relative to the spool.
+    """
+    spool = Path(spool)
+    spool.mkdir(parents=True, exist_ok=True)
+    job = spool / f"{name or f'{time.time_ns():020d}-{os.getpid()}'}{JOB_SUFFIX}"
+    _write_json(job, item._asdict() if isinstance(item, BatchItem) else item)
+    return job
+
+
+def job_name(path: Path) -> str:
+    """Get the name of a job from its job, claim or result file."""
+    name = path.name
+    if name.endswith(CLAIM_SUFFIX):
+        # Claims are named `<job>.job.<worker>.claim`.
+        name = name[: -len(CLAIM_SUFFIX)].rpartition(".")[0]
+    return name.split(JOB_SUFFIX)[0]
+
+
+def claim_job(job: Path, worker: str) -> Optional[Path]:
+    """Claim a job by renaming it, or return None if another worker claimed it first."""
+    claim = job.with_name(f"{job.name}.{worker}{CLAIM_SUFFIX}")
+    try:
+        # Renaming keeps the job's modification time, so touch it first; otherwise a job that
+        # waited in the spool longer than `stale_after` would look stale as soon as it's claimed.
+        os.utime(job)
+        os.rename(job, claim)
+    except FileNotFoundError:
+        return None
+    return claim
+
+
+def recover_stale(spool: Path, stale_after: float) -> List[Path]:
+    """Put claims that haven't been touched for `stale_after` seconds back in the spool."""
+    recovered = []
+    now = time.time()
+    for claim in spool.glob(f"*{JOB_SUFFIX}.*{CLAIM_SUFFIX}"):
+        job = claim.with_name(job_name(claim) + JOB_SUFFIX)
+        try:
+            if now - claim.stat().st_mtime < stale_after:
+                continue
+            os.rename(claim, job)
+        except FileNotFoundError:
+            # Finished, or recovered by another worker.
+            continue
+        recovered.append(job)
+    return recovered
+
+
+@contextmanager
+def _heartbeat(claim: Path, interval: float) -> Iterator[None]:
+    """Touch a claim every interval seconds, so other workers know it isn't stale."""
+    stopped = threading.Event()
+
+    def beat() -> None:
+        while not stopped.wait(interval):
+            try:
+                os.utime(claim)
+            except OSError:
+                return
+
+    thread = threading.Thread(target=beat, daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        stopped.set()
+        thread.join()
+
+
+def run_job(claim: Path, worker: str) -> Optional[JobResult]:
+    """Generate a claimed job's favicon set, & record the result next to it.
+
+    Returns None if the claim was taken for stale & put back in the spool before the job
+    finished, in which case the worker that runs it again records the result.
+    """
+    name = job_name(claim)
+    start = time.perf_counter()
+    try:
+        text = claim.read_text()
+    except FileNotFoundError:
+        return None
+    try:
+        item = _parse_row(_json.loads(text), claim.parent)
+        (batch_result,) = _generate_group((item,))
+        status, error = batch_result.status, batch_result.error
+    except Exception as err:
+        status, error = "error", _error(err)
+
+    result = JobResult(name, status, worker, time.perf_counter() - start, error)
+    try:
+        # Finishing the claim first means a result is only ever written by its owner.
+        os.rename(claim, claim.with_name(name + (DONE_SUFFIX if status == "ok" else FAILED_SUFFIX)))
+    except FileNotFoundError:
+        return None
+    _write_json(claim.with_name(name + RESULT_SUFFIX), result.dict())
+    return result
+
+
+def _work(
+    spool: Path,
+    stop: "Event",
+    results: "multiprocessing.Queue[JobResult]",
+    poll_interval: float,
+    stale_after: float,
+    drain: bool,
+) -> None:
+    """Claim & run jobs until stopped, or until the spool is empty if draining.
+
+    Runs in a worker process, which finishes its current job when interrupted or terminated.
+    """
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    worker = worker_id()
+
+    while not stop.is_set():
+        for job in recover_stale(spool, stale_after):
+            results.put(JobResult(job_name(job), "recovered", worker))
+
+        claimed = False
+        for job in sorted(spool.glob(f"*{JOB_SUFFIX}")):
+            if stop.is_set():
+                return
+            claim = claim_job(job, worker)
+            if claim is None:
+                continue
+            claimed = True
+            with _heartbeat(claim, stale_after / 4):
+                result = run_job(claim, worker)
+            if result is not None:
+                results.put(result)
+
+        if not claimed:
+            if drain:
+                return
+            stop.wait(poll_interval)
+
+
+class SpoolWorker:
+    """Run jobs from a spool directory on several local processes.
+
+    Each job is a JSON file named `<name>.job`, with the same fields as a batch manifest row. A
+    process claims a job by atomically renaming it to `<name>.job.<worker>.claim`, so any number
+    of processes on any number of machines sharing the spool can run concurrently. Once the job
+    is done, the claim is renamed to `<name>.done` or `<name>.failed`, & its result (& any error)
+    is written to `<name>.result.json`.
+
+    Claims are touched while their job runs. A claim left untouched for `stale_after` seconds,
+    because its worker crashed or its machine went down, is put back in the spool. Machines'
+    clocks are expected to agree to well within `stale_after`.
+    """
+
+    def __init__(
+        self,
+        spool: LoosePath,
+        processes: Optional[int] = None,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        stale_after: float = DEFAULT_STALE_AFTER,
+        drain: bool = False,
+    ) -> None:
+        """Prepare to work on spool."""
+        # Standard Library
+        import multiprocessing
+
+        self.spool = Path(spool)
+        self.spool.mkdir(parents=True, exist_ok=True)
+        self.processes = processes or os.cpu_count() or 1
+        self.poll_interval = poll_interval
+        self.stale_after = stale_after
+        self.drain = drain
+        self.stats = WorkerStats()
+        self._stop = multiprocessing.Event()
+
+    def stop(self) -> None:
+        """Stop claiming jobs; each process finishes the job it's running first."""
+        self._stop.set()
+
+    def run(self) -> Iterator[JobResult]:
+        """Start worker processes & yield each result as it's recorded, until they all stop."""
+        # Standard Library
+        import multiprocessing
+
+        results: "multiprocessing.Queue[JobResult]" = multiprocessing.Queue()
+        args = (self.spool, self._stop, results, self.poll_interval, self.stale_after, self.drain)
+        processes = [
+            multiprocessing.Process(target=_work, args=args, daemon=True)
+            for _ in range(self.processes)
+        ]
+        self.stats = WorkerStats()
+        for process in processes:
+            process.start()
+        try:
+            running = True
+            while running:
+                # Results a process sent just before it exited are still read once it has.
+                running = any(p.is_alive() for p in processes)
+                try:
+                    while True:
+                        result = results.get(timeout=0.1)
+                        self.stats.record(result)
+                        yield result
+                except queue.Empty:
+                    pass
+        finally:
+            self.stop()
+            for process in processes:
+                process.join()
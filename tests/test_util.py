@@ -0,0 +1,41 @@
+"""Test utility functions."""
+
+# Standard Library
+import io
+import unittest
+
+# Project
+from favicons._util import is_svg
+
+SVG = b'<svg xmlns="http://www.w3.org/2000/svg" width="16" height="16"/>'
+
+
+class IsSvgTest(unittest.TestCase):
+    """Detect in-memory SVG sources past their prolog."""
+
+    def assert_svg(self, data: bytes, expected: bool) -> None:
+        """Check detection at several chunk sizes, & that the stream position is kept."""
+        for chunk_size in (1, 7, 4096):
+            stream = io.BytesIO(data)
+            self.assertEqual(is_svg(stream, chunk_size), expected)
+            self.assertEqual(stream.tell(), 0)
+
+    def test_long_prolog(self) -> None:
+        """A license comment longer than a chunk doesn't hide the root element."""
+        comment = b"<!-- " + b"Licensed under the terms of the license. " * 40 + b"-->\n"
+        self.assert_svg(b'<?xml version="1.0"?>\n' + comment + SVG, True)
+
+    def test_doctype(self) -> None:
+        """A DOCTYPE with an internal subset & a byte order mark are skipped."""
+        doctype = b'<!DOCTYPE svg PUBLIC "-//W3C//DTD SVG 1.1//EN" [ <!ENTITY a "<b>"> ]>\n'
+        self.assert_svg(b"\xef\xbb\xbf" + doctype + SVG, True)
+
+    def test_not_svg(self) -> None:
+        """Other documents & images aren't SVGs, even if they contain an SVG element."""
+        self.assert_svg(b"<html><svg></svg></html>", False)
+        self.assert_svg(b"\x89PNG\r\n\x1a\n" + SVG, False)
+        self.assert_svg(b"", False)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+"""Test spool workers claiming & recovering jobs."""
+
+# Standard Library
+import os
+import json
+import time
+import tempfile
+import unittest
+from pathlib import Path
+
+# Third Party
+from PIL import Image
+
+# Project
+from favicons._worker import (
+    RESULT_SUFFIX,
+    run_job,
+    claim_job,
+    submit_job,
+    recover_stale,
+)
+
+STALE_AFTER = 60.0
+
+
+class ClaimRaceTest(unittest.TestCase):
+    """A worker whose claim was recovered as stale mustn't clobber the new owner's result."""
+
+    def setUp(self) -> None:
+        """Submit a job that has waited in the spool for longer than `STALE_AFTER`."""
+        self._temp = tempfile.TemporaryDirectory()
+        self.spool = Path(self._temp.name)
+        Image.new("RGBA", (64, 64), "#ff0000").save(self.spool / "logo.png")
+        self.job = submit_job(
+            self.spool, {"source": "logo.png", "output_directory": "out"}, name="old"
+        )
+        waited = time.time() - STALE_AFTER * 2
+        os.utime(self.job, (waited, waited))
+
+    def tearDown(self) -> None:
+        """Remove the spool."""
+        self._temp.cleanup()
+
+    def test_claimed_job_is_not_stale(self) -> None:
+        """Claiming a job that waited in the spool doesn't make it look stale."""
+        claim = claim_job(self.job, "a")
+        self.assertIsNotNone(claim)
+        self.assertEqual(recover_stale(self.spool, STALE_AFTER), [])
+
+    def test_recovered_claim_is_not_recorded(self) -> None:
+        """The original worker records nothing once its claim is taken & run by another."""
+        claim_a = claim_job(self.job, "a")
+        assert claim_a is not None
+        # Worker a stops touching its claim, so worker b takes it for stale & runs it.
+        stopped = time.time() - STALE_AFTER * 2
+        os.utime(claim_a, (stopped, stopped))
+        self.assertEqual(recover_stale(self.spool, STALE_AFTER), [self.job])
+        claim_b = claim_job(self.job, "b")
+        assert claim_b is not None
+        result_b = run_job(claim_b, "b")
+        assert result_b is not None
+        self.assertEqual(result_b.status, "ok")
+
+        self.assertIsNone(run_job(claim_a, "a"))
+        record = json.loads((self.spool / f"old{RESULT_SUFFIX}").read_text())
+        self.assertEqual(record["worker"], "b")
+        self.assertEqual(record["status"], "ok")
+        self.assertTrue((self.spool / "old.done").exists())
+
+
+if __name__ == "__main__":
+    unittest.main()